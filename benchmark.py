@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+1pux-to-csv 效能基準測試
+
+產生可調整大小與結構的合成 1PUX 檔案，並量測各轉換階段的耗時、吞吐量與記憶體峰值
+"""
+
+import argparse
+import json
+import random
+import string
+import sys
+import tempfile
+import time
+import tracemalloc
+import zipfile
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple
+
+import main
+
+
+class BenchmarkResult(NamedTuple):
+    """單一基準測試的結果"""
+    name: str
+    items: int
+    seconds: float
+    peak_bytes: int
+
+    @property
+    def items_per_second(self) -> float:
+        return self.items / self.seconds if self.seconds else 0.0
+
+
+def _random_text(rng: random.Random, length: int) -> str:
+    """產生指定長度、含空白與換行的隨機文字"""
+    alphabet = string.ascii_letters + string.digits + '     \n'
+    return ''.join(rng.choice(alphabet) for _ in range(length))
+
+
+def make_item(rng: random.Random, index: int, args: argparse.Namespace) -> Dict[str, Any]:
+    """依設定產生一個合成的 1PUX login item"""
+    urls = [
+        {'label': '' if n == 0 else f'alt {n}', 'url': f'https://site{index}-{n}.example.com/login'}
+        for n in range(args.urls)
+    ]
+
+    fields: List[Dict[str, Any]] = []
+    value_makers = [
+        lambda n: {'string': f'value {index}-{n}'},
+        lambda n: {'concealed': _random_text(rng, 12)},
+        lambda n: {'menu': 'option'},
+        lambda n: {'ssoLogin': {'provider': 'google'}},
+        lambda n: {'address': {'street': f'{n} Main St', 'city': 'Taipei', 'zip': '100', 'country': 'tw'}},
+    ]
+    for n in range(args.fields_per_section):
+        fields.append({
+            'title': f'field {n}',
+            'id': f'field{n}',
+            'value': value_makers[n % len(value_makers)](n),
+        })
+    sections = [
+        {'title': f'Section {s}', 'name': f'section{s}', 'fields': list(fields)}
+        for s in range(args.sections)
+    ]
+    if sections and rng.random() < args.totp_ratio:
+        sections[0]['fields'].insert(0, {
+            'title': 'one-time password',
+            'id': f'TOTP_{index}',
+            'value': {'totp': f'otpauth://totp/item{index}?secret=JBSWY3DPEHPK3PXP'},
+        })
+
+    return {
+        'uuid': f'{index:026x}',
+        'favIndex': 0,
+        'createdAt': 1600000000 + index,
+        'updatedAt': 1700000000 + index,
+        'state': 'archived' if rng.random() < args.archived_ratio else 'active',
+        'categoryUuid': '001',
+        'details': {
+            'loginFields': [
+                {'value': f'user{index}@example.com', 'name': 'username',
+                 'fieldType': 'E', 'designation': 'username'},
+                {'value': _random_text(rng, 20), 'name': 'password',
+                 'fieldType': 'P', 'designation': 'password'},
+                {'value': 'remember', 'name': 'remember_me', 'fieldType': 'C'},
+            ],
+            'notesPlain': _random_text(rng, args.notes_length),
+            'sections': sections,
+            'passwordHistory': [{'value': 'old', 'time': 1600000000}],
+        },
+        'overview': {
+            'subtitle': f'user{index}@example.com',
+            'urls': urls,
+            'title': f'Item {index}',
+            'url': urls[0]['url'] if urls else '',
+            'tags': ['bench', f'group{index % 10}'],
+        },
+    }
+
+
+def generate_1pux(path: Path, args: argparse.Namespace) -> int:
+    """產生合成 1PUX 檔案，逐一寫入 items 以免產生器本身佔用大量記憶體，回傳 item 數"""
+    rng = random.Random(args.seed)
+    compression = zipfile.ZIP_STORED if args.stored else zipfile.ZIP_DEFLATED
+
+    with zipfile.ZipFile(path, 'w', compression) as zip_file:
+        zip_file.writestr('export.attributes', json.dumps({'version': 3, 'createdAt': 1700000000}))
+
+        with zip_file.open('export.data', 'w', force_zip64=True) as raw:
+            def write(text: str):
+                raw.write(text.encode('utf-8'))
+
+            write('{"accounts":[{"attrs":{"accountName":"Benchmark","uuid":"BENCHACCOUNT"},"vaults":[')
+            index = 0
+            for vault in range(args.vaults):
+                # 平均分配 items 到各 vault，餘數放在最後一個
+                count = args.items // args.vaults
+                if vault == args.vaults - 1:
+                    count += args.items % args.vaults
+
+                if vault:
+                    write(',')
+                attrs = {'uuid': f'VAULT{vault:05d}', 'name': f'Vault {vault}', 'type': 'U'}
+                write(f'{{"attrs":{json.dumps(attrs)},"items":[')
+                for n in range(count):
+                    if n:
+                        write(',')
+                    write(json.dumps(make_item(rng, index, args), ensure_ascii=False))
+                    index += 1
+                write(']}')
+            write(']}]}')
+
+    return args.items
+
+
+def measure(name: str, items: int, func: Callable[[], Any], repeat: int) -> BenchmarkResult:
+    """取 repeat 次中最快的耗時，另外以 tracemalloc 執行一次量測記憶體峰值"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    # tracemalloc 會明顯拖慢執行速度，因此與計時分開量測
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return BenchmarkResult(name, items, best, peak)
+
+
+def run_benchmarks(one_pux_path: Path, output_path: Path, args: argparse.Namespace) -> List[BenchmarkResult]:
+    """依序量測 extract_export_data、逐項轉換、build_notes 與完整轉換流程"""
+    data = main.extract_export_data(one_pux_path)
+    items = [
+        item
+        for account in data.get('accounts', [])
+        for vault in account.get('vaults', [])
+        for item in vault.get('items', [])
+    ]
+    del data
+
+    def convert_rows():
+        for item in items:
+            main.convert_item_to_csv_row(item)
+
+    def build_all_notes():
+        for item in items:
+            main.build_notes(item.get('details', {}), item.get('overview', {}))
+
+    def end_to_end():
+        main.convert_1pux_to_csv(one_pux_path, output_path, True, args.jobs)
+
+    return [
+        measure('extract_export_data', len(items), lambda: main.extract_export_data(one_pux_path), args.repeat),
+        measure('convert_item_to_csv_row', len(items), convert_rows, args.repeat),
+        measure('build_notes', len(items), build_all_notes, args.repeat),
+        measure('convert_1pux_to_csv', len(items), end_to_end, args.repeat),
+    ]
+
+
+def format_results(results: List[BenchmarkResult]) -> str:
+    """將結果格式化為文字表格"""
+    # 表頭使用英文，避免全形字寬度造成欄位無法對齊
+    lines = [f"{'stage':<28}{'items':>10}{'seconds':>12}{'items/s':>14}{'peak MB':>12}"]
+    for result in results:
+        lines.append(
+            f"{result.name:<28}{result.items:>10}{result.seconds:>12.3f}"
+            f"{result.items_per_second:>14.0f}{result.peak_bytes / 1024 / 1024:>12.1f}"
+        )
+    return '\n'.join(lines)
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description='1pux-to-csv 效能基準測試')
+    parser.add_argument('--items', type=int, default=10000, help='item 總數（預設 10000）')
+    parser.add_argument('--vaults', type=int, default=4, help='vault 數量（預設 4）')
+    parser.add_argument('--sections', type=int, default=2, help='每個 item 的 section 數（預設 2）')
+    parser.add_argument('--fields-per-section', type=int, default=5, help='每個 section 的欄位數（預設 5）')
+    parser.add_argument('--totp-ratio', type=float, default=0.3, help='含 TOTP 的 item 比例（預設 0.3）')
+    parser.add_argument('--urls', type=int, default=2, help='每個 item 的 URL 數（預設 2）')
+    parser.add_argument('--notes-length', type=int, default=200, help='notesPlain 的字元數（預設 200）')
+    parser.add_argument('--archived-ratio', type=float, default=0.05, help='已歸檔 item 的比例（預設 0.05）')
+    parser.add_argument('--stored', action='store_true', help='以不壓縮（ZIP_STORED）方式產生 1PUX')
+    parser.add_argument('--seed', type=int, default=0, help='亂數種子（預設 0）')
+    parser.add_argument('--repeat', type=int, default=3, help='每個階段重複次數，取最快值（預設 3）')
+    parser.add_argument('-j', '--jobs', type=int, default=1, help='完整轉換流程使用的行程數（預設 1）')
+    parser.add_argument('--keep', type=Path, help='保留產生的 1PUX 檔案到此路徑')
+    parser.add_argument('--json', action='store_true', help='以 JSON 格式輸出結果')
+    args = parser.parse_args()
+
+    if args.vaults < 1 or args.items < 0:
+        parser.error('--vaults 至少為 1，--items 不可為負數')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        one_pux_path = args.keep or Path(tmp) / 'benchmark.1pux'
+        start = time.perf_counter()
+        generate_1pux(one_pux_path, args)
+        print(
+            f"已產生 {args.items} 筆 items（{one_pux_path.stat().st_size / 1024 / 1024:.1f} MB），"
+            f"耗時 {time.perf_counter() - start:.2f} 秒",
+            file=sys.stderr,
+        )
+
+        results = run_benchmarks(one_pux_path, Path(tmp) / 'benchmark.csv', args)
+
+    if args.json:
+        print(json.dumps(
+            [dict(r._asdict(), items_per_second=r.items_per_second) for r in results],
+            indent=2,
+        ))
+    else:
+        print(format_results(results))
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main_cli())
@@ -5,33 +5,663 @@
 將 1Password 的 1PUX 格式轉換為 Apple CSV 格式
 """
 
+import abc
 import argparse
+import codecs
 import csv
+import glob
+import hashlib
+import io
+import itertools
 import json
+import lzma
+import mmap
+import multiprocessing
+import os
+import queue
+import re
+import shutil
+import sqlite3
+import struct
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import urllib.parse
 import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import contextmanager, nullcontext, suppress
+from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import (
+    Any, BinaryIO, Callable, ContextManager, Dict, Iterable, Iterator, List, NamedTuple, Optional,
+    Sequence, TextIO, Tuple, Type, Union,
+)
 
+try:
+    import zstandard
+except ImportError:  # zstd 輸出為選用功能
+    zstandard = None
 
-def extract_export_data(one_pux_path: Path) -> Dict[str, Any]:
-    """從 1PUX ZIP 檔案中提取 export.data JSON 資料"""
-    if not one_pux_path.exists():
-        raise FileNotFoundError(f"找不到檔案: {one_pux_path}")
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # Parquet 輸出為選用功能
+    pyarrow = None
+
+
+# 1PUX 中 export.data 的標準路徑
+EXPORT_DATA_NAME = 'export.data'
+
+# ZIP local file header：簽章、檔名長度與 extra 欄位長度
+_LOCAL_HEADER = struct.Struct('<4s22xHH')
+
+# 串流解析時每次從 export.data 解壓縮讀取的位元組數
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# 多行程轉換時每批送往 worker 的 item 數
+JOBS_BATCH_SIZE = 256
+
+# 單一行程使用快取時每次查詢的 item 數；批次太大時已解析的 items 停留較久，反而變慢
+CACHE_BATCH_SIZE = 32
+
+# 輸出檔預設累積 4 MiB 後才一次寫入
+OUTPUT_BUFFER_SIZE = 4 * 1024 * 1024
+
+# 輸出壓縮格式與對應的副檔名
+COMPRESSION_SUFFIXES = {'gzip': '.gz', 'xz': '.xz', 'zstd': '.zst'}
+
+# 1PUX 中附件與文件的目錄，成員名稱為 files/<documentId>__<fileName>
+ATTACHMENTS_DIR_NAME = 'files/'
+
+# Parquet 輸出每個 row group 的筆數
+PARQUET_ROW_GROUP_SIZE = 64 * 1024
+
+# SQLite 輸出每次 executemany 寫入的筆數
+SQLITE_BATCH_SIZE = 10000
+
+# 以 - 作為輸入或輸出路徑時代表 stdin／stdout
+STDIO_PATH = Path('-')
+
+# 轉換快取的格式版本，轉換規則改變時遞增以讓舊快取失效
+ROW_CACHE_VERSION = 1
+
+# 1PUX 來源：檔案路徑，或已讀入記憶體的 stdin 內容
+OnePuxSource = Union[Path, io.BytesIO]
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_NUMBER_TAIL = re.compile(r'[0-9.eE+\-]*')
+
+
+class StageStats:
+    """單一處理階段的累計統計"""
+    __slots__ = ('wall', 'cpu', 'peak_bytes', 'calls')
+
+    def __init__(self):
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.peak_bytes = 0
+        self.calls = 0
+
+
+class StageProfiler:
+    """記錄各處理階段（unzip、parse、convert、notes、write）的 wall time、CPU time 與記憶體峰值
+
+    巢狀階段採獨佔計時，子階段的時間不會重複計入父階段；記憶體峰值則包含子階段。
+    以 --jobs 轉換時只量測主行程，convert 代表等待 worker 結果的時間。
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, StageStats] = {}
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.peak_bytes = 0
+        self._stack: List[List[Any]] = []
+
+    def _charge(self, frame: List[Any], wall: float, cpu: float):
+        stats = self.stages.setdefault(frame[0], StageStats())
+        stats.wall += wall - frame[1]
+        stats.cpu += cpu - frame[2]
+
+    def _record_peak(self, peak: int, frames: Iterable[List[Any]]):
+        self.peak_bytes = max(self.peak_bytes, peak)
+        for frame in frames:
+            stats = self.stages.setdefault(frame[0], StageStats())
+            stats.peak_bytes = max(stats.peak_bytes, peak)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """量測一個處理階段"""
+        wall, cpu = time.perf_counter(), time.process_time()
+        if self._stack:
+            self._charge(self._stack[-1], wall, cpu)
+        if tracemalloc.is_tracing():
+            # 重設峰值前先把目前為止的峰值記到外層階段
+            self._record_peak(tracemalloc.get_traced_memory()[1], self._stack)
+            tracemalloc.reset_peak()
+        frame = [name, wall, cpu]
+        self._stack.append(frame)
+
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter(), time.process_time()
+            self._stack.pop()
+            self._charge(frame, wall, cpu)
+            self.stages[name].calls += 1
+            if tracemalloc.is_tracing():
+                self._record_peak(tracemalloc.get_traced_memory()[1], self._stack + [frame])
+            if self._stack:
+                self._stack[-1][1:] = [wall, cpu]
+
+    @contextmanager
+    def activate(self) -> Iterator['StageProfiler']:
+        """在此區塊內啟用量測，並以 tracemalloc 追蹤記憶體"""
+        global _active_profiler
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        _active_profiler = self
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield self
+        finally:
+            self.wall += time.perf_counter() - wall
+            self.cpu += time.process_time() - cpu
+            self._record_peak(tracemalloc.get_traced_memory()[1], [])
+            _active_profiler = None
+            if started_tracing:
+                tracemalloc.stop()
+
+    def report(self) -> Dict[str, Any]:
+        """以 dict 回傳量測結果，other 為未歸入任何階段的時間"""
+        stages = {
+            name: {
+                'wall_seconds': stats.wall,
+                'cpu_seconds': stats.cpu,
+                'peak_bytes': stats.peak_bytes,
+                'calls': stats.calls,
+            }
+            for name, stats in self.stages.items()
+        }
+        stages['other'] = {
+            'wall_seconds': max(self.wall - sum(s.wall for s in self.stages.values()), 0.0),
+            'cpu_seconds': max(self.cpu - sum(s.cpu for s in self.stages.values()), 0.0),
+            'peak_bytes': None,
+            'calls': None,
+        }
+        return {
+            'stages': stages,
+            'total': {'wall_seconds': self.wall, 'cpu_seconds': self.cpu, 'peak_bytes': self.peak_bytes},
+        }
+
+    def format_report(self, fmt: str = 'text') -> str:
+        """將量測結果格式化為文字摘要或 JSON"""
+        report = self.report()
+        if fmt == 'json':
+            return json.dumps(report, indent=2)
+
+        # 表頭使用英文，避免全形字寬度造成欄位無法對齊
+        lines = [f"{'stage':<10}{'wall s':>10}{'cpu s':>10}{'peak MB':>10}{'calls':>10}"]
+        for name, stats in list(report['stages'].items()) + [('total', report['total'])]:
+            peak = stats['peak_bytes']
+            lines.append(
+                f"{name:<10}{stats['wall_seconds']:>10.3f}{stats['cpu_seconds']:>10.3f}"
+                f"{'' if peak is None else f'{peak / 1024 / 1024:.1f}':>10}"
+                f"{stats.get('calls') or '':>10}"
+            )
+        return '\n'.join(lines)
+
+
+# 目前啟用中的 StageProfiler，未啟用時為 None
+_active_profiler: Optional[StageProfiler] = None
+
+_NULL_STAGE = nullcontext()
+
+
+def profile_stage(name: str) -> ContextManager[None]:
+    """若已啟用 StageProfiler 則量測此階段，否則不做任何事"""
+    if _active_profiler is None:
+        return _NULL_STAGE
+    return _active_profiler.stage(name)
+
+
+def index_members_by_basename(zip_file: zipfile.ZipFile) -> Dict[str, zipfile.ZipInfo]:
+    """以檔名（不含目錄）建立 ZIP 成員索引，同名時保留第一個"""
+    index: Dict[str, zipfile.ZipInfo] = {}
+    for info in zip_file.infolist():
+        index.setdefault(info.filename.rpartition('/')[2], info)
+    return index
+
+
+def find_export_data(zip_file: zipfile.ZipFile) -> zipfile.ZipInfo:
+    """取得 1PUX ZIP 檔案中 export.data 的 ZipInfo
+
+    先直接查詢標準路徑，只有 export.data 不在根目錄時才需要走訪整個中央目錄建立索引。
+    """
+    try:
+        return zip_file.getinfo(EXPORT_DATA_NAME)
+    except KeyError:
+        pass
+
+    info = index_members_by_basename(zip_file).get(EXPORT_DATA_NAME)
+    if info is None:
+        raise ValueError("在 1PUX 檔案中找不到 export.data")
+    return info
+
+
+class MappedMemberReader:
+    """直接從 mmap 讀取未壓縮（ZIP_STORED）的 ZIP 成員，不經過 ZipFile 的讀取緩衝
+
+    read() 回傳指向 mmap 的 memoryview 切片，不會複製資料；讀到結尾時驗證 CRC。
+    """
+
+    def __init__(self, view: memoryview, crc: int):
+        self._view = view
+        self._expected_crc = crc
+        self._crc = 0
+        self._pos = 0
+
+    def read(self, size: int = -1) -> memoryview:
+        end = len(self._view) if size is None or size < 0 else self._pos + size
+        chunk = self._view[self._pos:end]
+        self._pos += len(chunk)
+        self._crc = zlib.crc32(chunk, self._crc)
+        if self._pos >= len(self._view) and self._crc != self._expected_crc:
+            chunk.release()
+            raise zipfile.BadZipFile("export.data 的 CRC 檢查失敗")
+        return chunk
+
+    def close(self):
+        self._view.release()
+
+
+def _stored_member_view(
+    archive: Any, info: zipfile.ZipInfo
+) -> Optional[memoryview]:
+    """取得 ZIP_STORED 成員資料在 mmap 中的位置，無法直接讀取時回傳 None"""
+    # 只處理未壓縮且未加密的成員
+    if info.compress_type != zipfile.ZIP_STORED or info.flag_bits & 0x1:
+        return None
+
+    header = archive[info.header_offset:info.header_offset + _LOCAL_HEADER.size]
+    if len(header) != _LOCAL_HEADER.size:
+        return None
+    signature, name_length, extra_length = _LOCAL_HEADER.unpack(header)
+    if signature != b'PK\x03\x04':
+        return None
+
+    start = info.header_offset + _LOCAL_HEADER.size + name_length + extra_length
+    if start + info.file_size > len(archive):
+        return None
+    return memoryview(archive)[start:start + info.file_size]
+
+
+def read_stdin_archive() -> io.BytesIO:
+    """將 stdin 的 1PUX 完整讀入記憶體（ZIP 需要可隨機存取的來源）"""
+    buffer = io.BytesIO()
+    shutil.copyfileobj(sys.stdin.buffer, buffer, 1024 * 1024)
+    # 在開始寫出 stdout 之前就先拒絕無效的輸入
+    if not zipfile.is_zipfile(buffer):
+        raise ValueError("stdin 的內容不是有效的 1PUX（ZIP）檔案")
+    buffer.seek(0)
+    return buffer
+
+
+def check_input_exists(source: OnePuxSource):
+    """確認輸入的 1PUX 檔案存在，記憶體中的來源不需檢查"""
+    if isinstance(source, Path) and not source.exists():
+        raise FileNotFoundError(f"找不到檔案: {source}")
+
+
+@contextmanager
+def _map_archive(source: OnePuxSource) -> Iterator[Any]:
+    """以 mmap 或記憶體中的緩衝區存取整個 1PUX，不需複製"""
+    if isinstance(source, io.BytesIO):
+        archive = source.getbuffer()
+        try:
+            yield archive
+        finally:
+            with suppress(BufferError):
+                archive.release()
+        return
+
+    with open(source, 'rb') as f:
+        archive = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield archive
+        finally:
+            # 例外的 traceback 可能仍持有 memoryview，此時交由垃圾回收關閉 mmap，
+            # 避免 BufferError 蓋過原本的錯誤
+            with suppress(BufferError):
+                archive.close()
+
+
+@contextmanager
+def open_export_data(one_pux_path: OnePuxSource) -> Iterator[Tuple[zipfile.ZipInfo, Any]]:
+    """開啟 1PUX 中的 export.data，回傳 (ZipInfo, 二進位讀取器)
+
+    未壓縮（ZIP_STORED）的 export.data 直接透過 mmap（或 stdin 的記憶體緩衝區）讀取，
+    其他情況使用 ZipFile.open。
+    """
+    check_input_exists(one_pux_path)
 
     with zipfile.ZipFile(one_pux_path, 'r') as zip_file:
-        # 尋找 export.data 檔案
-        export_data_path = None
-        for name in zip_file.namelist():
-            if name.endswith('export.data') or name == 'export.data':
-                export_data_path = name
-                break
+        export_data_info = find_export_data(zip_file)
+
+        if export_data_info.compress_type == zipfile.ZIP_STORED and export_data_info.file_size:
+            with _map_archive(one_pux_path) as archive:
+                view = _stored_member_view(archive, export_data_info)
+                if view is not None:
+                    reader = MappedMemberReader(view, export_data_info.CRC)
+                    try:
+                        yield export_data_info, reader
+                    finally:
+                        reader.close()
+                    return
 
-        if not export_data_path:
-            raise ValueError("在 1PUX 檔案中找不到 export.data")
+        with zip_file.open(export_data_info) as raw:
+            yield export_data_info, raw
 
+
+def extract_export_data(one_pux_path: OnePuxSource) -> Dict[str, Any]:
+    """從 1PUX ZIP 檔案中提取 export.data JSON 資料"""
+    with open_export_data(one_pux_path) as (_, f):
         # 讀取並解析 JSON
-        with zip_file.open(export_data_path) as f:
-            return json.load(f)
+        return json.loads(codecs.decode(f.read(), 'utf-8-sig'))
+
+
+class JSONStreamReader:
+    """從文字串流中逐步解析 JSON，只在需要時才讀取下一個區塊
+
+    stream 只需提供 read(size) -> str，例如文字檔案或 DecodedChunkReader。
+    """
+
+    def __init__(self, stream: Any, chunk_size: int = STREAM_CHUNK_SIZE):
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self, size: int) -> bool:
+        """讀取下一個區塊並丟棄已解析的部分，串流結束時回傳 False"""
+        if self._eof:
+            return False
+
+        with profile_stage('unzip'):
+            chunk = self._stream.read(size)
+        if not chunk:
+            self._eof = True
+            return False
+
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _peek(self) -> str:
+        """跳過空白並回傳下一個字元（不消耗），串流結束時回傳空字串"""
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill(self._chunk_size):
+                return ''
+
+    def _expect(self, char: str):
+        if self._peek() != char:
+            raise ValueError(f"export.data 格式錯誤：預期 {char!r}")
+        self._pos += 1
+
+    def _next_separator(self, closing: str) -> bool:
+        """消耗元素之間的逗號，遇到結尾符號時回傳 False"""
+        char = self._peek()
+        self._pos += 1
+        if char == ',':
+            return True
+        if char == closing:
+            return False
+        raise ValueError(f"export.data 格式錯誤：預期 ',' 或 {closing!r}")
+
+    def read_value(self) -> Any:
+        """完整解析下一個 JSON 值"""
+        with profile_stage('parse'):
+            return self._read_value()
+
+    def _read_value(self) -> Any:
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                # 值被區塊切斷，加倍讀取量後重試，避免大型項目反覆重新解析
+                if not self._fill(max(self._chunk_size, len(self._buf))):
+                    raise
+                continue
+
+            # 數字可能在區塊邊界被截斷（例如 "1." 或 "12"），需確認後面還有其他字元
+            if (
+                _NUMBER_TAIL.match(self._buf, end).end() == len(self._buf)
+                and self._fill(self._chunk_size)
+            ):
+                continue
+
+            self._pos = end
+            return value
+
+    def skip_value(self, levels: int = 0):
+        """略過下一個 JSON 值，不交給呼叫端
+
+        最外層的 levels 層陣列／物件逐一拆開略過其元素，更深的值直接以 C 解析器讀取後丟棄，
+        因此略過整個 vault 時記憶體用量仍以單一 item 為上限。以 re 掃描原始文字、不建立物件的
+        做法實測比 C 解析器慢，因此略過的值仍會完整解析。
+        """
+        char = self._peek()
+        if levels and char == '[':
+            for _ in self.iter_array():
+                self.skip_value(levels - 1)
+        elif levels and char == '{':
+            for _ in self.iter_object():
+                self.skip_value(levels - 1)
+        else:
+            self.read_value()
+
+    def iter_array(self) -> Iterator[None]:
+        """逐一定位陣列元素，由呼叫端負責讀取每個元素"""
+        self._expect('[')
+        if self._peek() == ']':
+            self._pos += 1
+            return
+
+        while True:
+            yield
+            if not self._next_separator(']'):
+                return
+
+    def iter_object(self) -> Iterator[str]:
+        """逐一產生物件的鍵，由呼叫端負責讀取對應的值"""
+        self._expect('{')
+        if self._peek() == '}':
+            self._pos += 1
+            return
+
+        while True:
+            key = self.read_value()
+            if not isinstance(key, str):
+                raise ValueError("export.data 格式錯誤：物件的鍵必須是字串")
+            self._expect(':')
+            yield key
+            if not self._next_separator('}'):
+                return
+
+
+class DecodedChunkReader:
+    """以固定大小的位元組區塊讀取二進位串流（例如 ZIP 的 deflate 串流），並逐步解碼為文字
+
+    每次只解壓縮與解碼 size 個位元組，解碼後的文字不會整份存在於記憶體中。
+    """
+
+    def __init__(self, raw: BinaryIO, encoding: str = 'utf-8-sig'):
+        self._raw = raw
+        self._decoder = codecs.getincrementaldecoder(encoding)()
+
+    def read(self, size: int) -> str:
+        """讀取 size 個位元組並回傳解碼後的文字，串流結束時回傳空字串"""
+        while True:
+            data = self._raw.read(size)
+            text = self._decoder.decode(data, final=not data)
+            # 區塊剛好只包含多位元組字元的前半段時，繼續讀取下一個區塊
+            if text or not data:
+                return text
+
+
+class ExportFilter:
+    """在解析 export.data 時套用的篩選條件，未指定的條件不篩選
+
+    account 與 vault 條件在讀到其 attrs 後就能判斷，不符合的 vault 中的 items 仍會逐一解析成 dict 後丟棄，
+    省下的只有轉換與寫出；item 條件（state、categoryUuid、updatedAt、tags）在每個 item 解析後、轉換前判斷。
+    """
+
+    def __init__(
+        self,
+        accounts: Iterable[str] = (),
+        vaults: Iterable[str] = (),
+        categories: Iterable[str] = (),
+        tags: Iterable[str] = (),
+        states: Iterable[str] = (),
+        updated_after: Optional[int] = None,
+        updated_before: Optional[int] = None,
+    ):
+        self.accounts = {value.casefold() for value in accounts}
+        self.vaults = {value.casefold() for value in vaults}
+        self.categories = set(categories)
+        self.tags = set(tags)
+        self.states = set(states)
+        self.updated_after = updated_after
+        self.updated_before = updated_before
+
+    @staticmethod
+    def _matches(attrs: Dict[str, Any], keys: Sequence[str], wanted: set) -> bool:
+        return any(str(attrs.get(key, '')).casefold() in wanted for key in keys)
+
+    def accepts_account(self, account: Dict[str, Any]) -> bool:
+        """依帳號名稱、email 或 uuid 判斷"""
+        return not self.accounts or self._matches(
+            account.get('attrs', {}), ('accountName', 'name', 'email', 'uuid'), self.accounts
+        )
+
+    def accepts_vault(self, vault: Dict[str, Any]) -> bool:
+        """依 vault 名稱或 uuid 判斷"""
+        return not self.vaults or self._matches(vault.get('attrs', {}), ('name', 'uuid'), self.vaults)
+
+    def accepts_item(self, item: Dict[str, Any]) -> bool:
+        """判斷 item 是否符合所有 item 條件（缺少的欄位視為預設值）"""
+        if self.states and item.get('state', 'active') not in self.states:
+            return False
+        if self.categories and item.get('categoryUuid', '') not in self.categories:
+            return False
+        if self.updated_after is not None or self.updated_before is not None:
+            updated_at = item.get('updatedAt')
+            if not isinstance(updated_at, (int, float)):
+                return False
+            if self.updated_after is not None and updated_at < self.updated_after:
+                return False
+            if self.updated_before is not None and updated_at >= self.updated_before:
+                return False
+        return not self.tags or bool(self.tags.intersection(item.get('overview', {}).get('tags', [])))
+
+    def read_item(self, reader: JSONStreamReader) -> Optional[Dict[str, Any]]:
+        """解析下一個 item，不符合條件時回傳 None，不會進入後續的轉換
+
+        item 整筆交給 C 解析器一次解析，比逐欄解析後再略過其餘欄位更快。
+        """
+        item = reader.read_value()
+        return item if self.accepts_item(item) else None
+
+
+def _iter_vault_items(
+    reader: JSONStreamReader, account: Dict[str, Any], export_filter: ExportFilter
+) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]]:
+    """走訪 account 的 vaults[].items[]，略過不符合條件的 vault"""
+    for _ in reader.iter_array():
+        vault: Dict[str, Any] = {}
+        # 非標準順序（attrs 在 items 之後）時還不知道 vault 名稱與是否符合條件，
+        # 先暫存符合 item 條件的項目，讀完 vault 後再產生，避免輸出空白的 vault 欄位
+        deferred: List[Dict[str, Any]] = []
+        for vault_key in reader.iter_object():
+            if vault_key != 'items':
+                vault[vault_key] = reader.read_value()
+                continue
+
+            if 'attrs' not in vault:
+                for _ in reader.iter_array():
+                    item = export_filter.read_item(reader)
+                    if item is not None:
+                        deferred.append(item)
+            elif not export_filter.accepts_vault(vault):
+                # 略過 items 陣列，逐一丟棄 item
+                reader.skip_value(levels=1)
+            else:
+                for _ in reader.iter_array():
+                    item = export_filter.read_item(reader)
+                    if item is not None:
+                        yield account, vault, item
+
+        if deferred and export_filter.accepts_vault(vault):
+            for item in deferred:
+                yield account, vault, item
+
+
+def iter_json_export_items(
+    reader: JSONStreamReader, export_filter: Optional[ExportFilter] = None
+) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]]:
+    """走訪 export.data 的 accounts[].vaults[].items[]，逐一產生 (account, vault, item)
+
+    提供 export_filter 時，不符合條件的 account、vault 與 item 在解析階段就會略過。
+    """
+    export_filter = export_filter or ExportFilter()
+    for key in reader.iter_object():
+        if key != 'accounts':
+            reader.skip_value()
+            continue
+
+        for _ in reader.iter_array():
+            account: Dict[str, Any] = {}
+            deferred: List[Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]] = []
+            for account_key in reader.iter_object():
+                if account_key != 'vaults':
+                    account[account_key] = reader.read_value()
+                    continue
+
+                if export_filter.accounts and 'attrs' not in account:
+                    deferred.extend(_iter_vault_items(reader, account, export_filter))
+                elif not export_filter.accepts_account(account):
+                    # 略過 vaults[].items[]，逐一丟棄 item
+                    reader.skip_value(levels=3)
+                else:
+                    yield from _iter_vault_items(reader, account, export_filter)
+
+            if deferred and export_filter.accepts_account(account):
+                yield from deferred
+
+
+def iter_export_items(
+    one_pux_path: OnePuxSource,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+    export_filter: Optional[ExportFilter] = None,
+) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]]:
+    """逐一產生 export.data 中的 (account, vault, item)，不需將整份 JSON 載入記憶體
+
+    account 與 vault 只包含 vaults/items 以外的欄位（例如 attrs）。export.data 以
+    chunk_size 位元組為單位從 ZIP 中解壓縮，記憶體用量以單一 item 的大小為上限。
+    """
+    with open_export_data(one_pux_path) as (_, raw):
+        reader = JSONStreamReader(DecodedChunkReader(raw), chunk_size)
+        yield from iter_json_export_items(reader, export_filter)
 
 
 def extract_username(login_fields: List[Dict[str, Any]]) -> Optional[str]:
@@ -50,6 +680,32 @@ def extract_password(login_fields: List[Dict[str, Any]]) -> Optional[str]:
     return None
 
 
+class LoginFields(NamedTuple):
+    """依 designation 分類後的 loginFields"""
+    username: Optional[str]
+    password: Optional[str]
+    others: List[Dict[str, Any]]
+
+
+def classify_login_fields(login_fields: List[Dict[str, Any]]) -> LoginFields:
+    """單次走訪 loginFields，分出 username、password（取第一個）與其他欄位"""
+    username = None
+    password = None
+    others = []
+    for field in login_fields:
+        designation = field.get('designation', '')
+        if designation == 'username':
+            if username is None:
+                username = field.get('value', '')
+        elif designation == 'password':
+            if password is None:
+                password = field.get('value', '')
+        else:
+            others.append(field)
+
+    return LoginFields(username, password, others)
+
+
 def extract_otp_auth(sections: List[Dict[str, Any]]) -> Optional[str]:
     """從 sections 中提取 OTP Auth"""
     for section in sections:
@@ -82,6 +738,89 @@ def extract_url(overview: Dict[str, Any]) -> Optional[str]:
     return None
 
 
+FieldFormatter = Callable[[Any], Optional[str]]
+
+# 1PUX value 類型鍵 → 格式化函數，依註冊順序決定多鍵 value 的優先順序
+FIELD_VALUE_FORMATTERS: Dict[str, FieldFormatter] = {}
+
+
+def register_field_formatter(value_type: str, formatter: Optional[FieldFormatter] = None):
+    """註冊 1PUX value 類型（例如 date、phone）的格式化函數，可作為 decorator 使用
+
+    格式化函數接收該類型鍵對應的值，回傳可讀字串，或回傳 None 表示略過此欄位。
+    重複註冊會覆蓋原本的函數。
+    """
+    def register(func: FieldFormatter) -> FieldFormatter:
+        FIELD_VALUE_FORMATTERS[value_type] = func
+        return func
+
+    if formatter is not None:
+        return register(formatter)
+    return register
+
+
+# decorator 由下往上註冊，concealed 的優先順序高於 string
+@register_field_formatter('string')
+@register_field_formatter('concealed')
+def _format_plain_value(value: Any) -> Optional[str]:
+    """concealed、string 類型直接返回"""
+    return value
+
+
+@register_field_formatter('ssoLogin')
+def _format_sso_login(sso_login: Any) -> Optional[str]:
+    """ssoLogin 類型：只需要 provider"""
+    if isinstance(sso_login, dict):
+        provider = sso_login.get('provider', '')
+        return provider if provider else None
+    return None
+
+
+@register_field_formatter('menu')
+def _format_menu(menu_value: Any) -> Optional[str]:
+    """menu 類型：選單選項"""
+    return menu_value if menu_value else None
+
+
+@register_field_formatter('address')
+def _format_address(addr: Any) -> Optional[str]:
+    """address 類型：格式化地址"""
+    if not isinstance(addr, dict):
+        return None
+
+    parts = []
+    if addr.get('street'):
+        parts.append(addr['street'])
+    city = addr.get('city', '')
+    state = addr.get('state', '')
+    zip_code = addr.get('zip', '')
+    country = addr.get('country', '')
+
+    # 組合城市、州、郵遞區號
+    city_parts = [p for p in [city, state, zip_code] if p]
+    if city_parts:
+        parts.append(', '.join(city_parts))
+
+    if country:
+        parts.append(country)
+
+    return ', '.join(parts) if parts else None
+
+
+# 其他未知類型常見的單一值鍵，值為空時會繼續嘗試下一個鍵
+_GENERIC_VALUE_TYPES = ('value', 'text', 'name', 'label')
+
+
+# decorator 由下往上註冊
+@register_field_formatter('label')
+@register_field_formatter('name')
+@register_field_formatter('text')
+@register_field_formatter('value')
+def _format_generic_value(value: Any) -> Optional[str]:
+    """通用單一值鍵：有值時轉為字串"""
+    return str(value) if value else None
+
+
 def format_field_value(field_value: Any) -> Optional[str]:
     """格式化不同類型的欄位值為可讀字串"""
     if not field_value:
@@ -91,68 +830,98 @@ def format_field_value(field_value: Any) -> Optional[str]:
     if isinstance(field_value, str):
         return field_value
 
-    # 字典類型需要根據不同類型處理
+    # 字典類型依 value 類型鍵查表處理
     if isinstance(field_value, dict):
-        # concealed 類型
-        if 'concealed' in field_value:
-            return field_value['concealed']
-
-        # string 類型
-        if 'string' in field_value:
-            return field_value['string']
-
-        # ssoLogin 類型：只需要 provider
-        if 'ssoLogin' in field_value:
-            sso_login = field_value['ssoLogin']
-            if isinstance(sso_login, dict):
-                provider = sso_login.get('provider', '')
-                return provider if provider else None
-            return None
-
-        # menu 類型：選單選項
-        if 'menu' in field_value:
-            menu_value = field_value['menu']
-            return menu_value if menu_value else None
-
-        # address 類型：格式化地址
-        if 'address' in field_value:
-            addr = field_value['address']
-            if isinstance(addr, dict):
-                parts = []
-                if addr.get('street'):
-                    parts.append(addr['street'])
-                city = addr.get('city', '')
-                state = addr.get('state', '')
-                zip_code = addr.get('zip', '')
-                country = addr.get('country', '')
-
-                # 組合城市、州、郵遞區號
-                city_parts = [p for p in [city, state, zip_code] if p]
-                if city_parts:
-                    parts.append(', '.join(city_parts))
-
-                if country:
-                    parts.append(country)
-
-                return ', '.join(parts) if parts else None
-
-        # 其他未知類型，嘗試取得第一個值或轉為字串
-        # 優先尋找常見的單一值鍵
-        for key in ['value', 'text', 'name', 'label']:
-            if key in field_value:
-                val = field_value[key]
-                if val:
-                    return str(val)
-
-        # 如果都沒有，返回 None（不輸出 JSON 結構）
+        # 1PUX 的 value 通常只有一個類型鍵，一次查表即可
+        if len(field_value) == 1:
+            value_type, value = next(iter(field_value.items()))
+            formatter = FIELD_VALUE_FORMATTERS.get(value_type)
+            return formatter(value) if formatter else None
+
+        # 多個鍵時依註冊順序使用第一個符合的類型；只有通用單一值鍵與非 dict 的 address
+        # 沒有結果時才繼續嘗試下一個類型
+        for value_type, formatter in FIELD_VALUE_FORMATTERS.items():
+            if value_type not in field_value:
+                continue
+            value = field_value[value_type]
+            formatted = formatter(value)
+            if formatted or not (
+                value_type in _GENERIC_VALUE_TYPES
+                or (value_type == 'address' and not isinstance(value, dict))
+            ):
+                return formatted
+
+        # 沒有對應的格式化函數時返回 None（不輸出 JSON 結構）
         return None
 
     # 其他類型轉為字串
     return str(field_value)
 
 
-def build_notes(details: Dict[str, Any], overview: Dict[str, Any]) -> str:
-    """建立 Notes 欄位，合併各種資訊"""
+class SectionField(NamedTuple):
+    """已格式化的非 OTP section 欄位"""
+    section_title: str
+    title: str
+    value: str
+
+
+class SectionIndex(NamedTuple):
+    """單次走訪 sections 後建立的索引，供 OTPAuth 與 Notes 共用"""
+    otp_auth: Optional[str]
+    totp_fields: List[Dict[str, Any]]
+    fields: List[SectionField]
+    titles: List[str]
+
+
+def index_sections(sections: List[Dict[str, Any]]) -> SectionIndex:
+    """單次走訪 sections，分出 TOTP 欄位、格式化其他欄位並收集 section 標題"""
+    otp_auth = None
+    otp_found = False
+    totp_fields = []
+    formatted_fields = []
+    titles = []
+
+    for section in sections:
+        section_title = section.get('title', '')
+        if section_title:
+            titles.append(section_title)
+
+        for field in section.get('fields', []):
+            # OTP 欄位只進入 OTPAuth，規則與 extract_otp_auth 相同（取第一個有效值）
+            if field.get('id', '').startswith('TOTP_'):
+                totp_fields.append(field)
+                if not otp_found:
+                    field_value = field.get('value', {})
+                    if isinstance(field_value, dict):
+                        totp = field_value.get('totp', '')
+                        if totp:
+                            otp_auth = totp
+                            otp_found = True
+                    elif isinstance(field_value, str):
+                        otp_auth = field_value
+                        otp_found = True
+                continue
+
+            # 使用格式化函數處理不同類型的 value
+            formatted_value = format_field_value(field.get('value', ''))
+            if formatted_value:
+                formatted_fields.append(
+                    SectionField(section_title, field.get('title', ''), formatted_value)
+                )
+
+    return SectionIndex(otp_auth, totp_fields, formatted_fields, titles)
+
+
+def build_notes(
+    details: Dict[str, Any],
+    overview: Dict[str, Any],
+    login_fields: Optional[LoginFields] = None,
+    section_index: Optional[SectionIndex] = None,
+) -> str:
+    """建立 Notes 欄位，合併各種資訊
+
+    login_fields 與 section_index 可傳入已建立的分類結果，避免重複走訪。
+    """
     notes_parts = []
 
     # 1. notesPlain
@@ -167,47 +936,32 @@ def build_notes(details: Dict[str, Any], overview: Dict[str, Any]) -> str:
         notes_parts.append(f"標籤: {tags_str}")
 
     # 3. 其他 loginFields（非 username/password）
-    login_fields = details.get('loginFields', [])
+    if login_fields is None:
+        login_fields = classify_login_fields(details.get('loginFields', []))
     other_fields = []
-    for field in login_fields:
-        designation = field.get('designation', '')
-        if designation not in ('username', 'password'):
-            field_name = field.get('name', '')
-            field_value = field.get('value', '')
-            if field_value:
-                if field_name:
-                    other_fields.append(f"{field_name}: {field_value}")
-                else:
-                    other_fields.append(field_value)
+    for field in login_fields.others:
+        field_name = field.get('name', '')
+        field_value = field.get('value', '')
+        if field_value:
+            if field_name:
+                other_fields.append(f"{field_name}: {field_value}")
+            else:
+                other_fields.append(field_value)
 
     if other_fields:
         notes_parts.append("其他欄位:\n" + "\n".join(f"  - {f}" for f in other_fields))
 
-    # 4. Sections 欄位（除了 OTP）
-    sections = details.get('sections', [])
+    # 4. Sections 欄位（除了 OTP，已經在 OTPAuth 欄位中）
+    if section_index is None:
+        section_index = index_sections(details.get('sections', []))
     section_fields = []
-    for section in sections:
-        section_title = section.get('title', '')
-        fields = section.get('fields', [])
-        for field in fields:
-            field_id = field.get('id', '')
-            # 跳過 OTP 欄位（已經在 OTPAuth 欄位中）
-            if field_id.startswith('TOTP_'):
-                continue
-
-            field_title = field.get('title', '')
-            field_value = field.get('value', '')
-
-            # 使用格式化函數處理不同類型的 value
-            formatted_value = format_field_value(field_value)
-
-            if formatted_value:
-                if section_title and field_title:
-                    section_fields.append(f"{section_title} - {field_title}: {formatted_value}")
-                elif field_title:
-                    section_fields.append(f"{field_title}: {formatted_value}")
-                else:
-                    section_fields.append(formatted_value)
+    for field in section_index.fields:
+        if field.section_title and field.title:
+            section_fields.append(f"{field.section_title} - {field.title}: {field.value}")
+        elif field.title:
+            section_fields.append(f"{field.title}: {field.value}")
+        else:
+            section_fields.append(field.value)
 
     if section_fields:
         notes_parts.append("額外資訊:\n" + "\n".join(f"  - {f}" for f in section_fields))
@@ -235,8 +989,72 @@ def build_notes(details: Dict[str, Any], overview: Dict[str, Any]) -> str:
     return "\n---\n".join(notes_parts)
 
 
-def convert_item_to_csv_row(item: Dict[str, Any]) -> Dict[str, str]:
-    """將 1PUX item 轉換為 CSV 行"""
+# Apple CSV 的欄位順序
+CSV_FIELDNAMES = ['Title', 'URL', 'Username', 'Password', 'Notes', 'OTPAuth']
+
+
+class ConvertedItem:
+    """轉換後的 item：Apple CSV 的六個欄位，加上 vault、分類、時間等中繼資料
+
+    以 __slots__ 保存，避免每筆資料各自配置一個 dict；各種輸出都直接讀取這些屬性。
+    """
+    __slots__ = (
+        'title', 'url', 'username', 'password', 'notes', 'otp_auth',
+        'uuid', 'vault_uuid', 'vault_name', 'category', 'state', 'tags',
+        'created_at', 'updated_at',
+    )
+
+    def __init__(
+        self,
+        title: str,
+        url: str,
+        username: str,
+        password: str,
+        notes: str,
+        otp_auth: str,
+        uuid: str = '',
+        vault_uuid: str = '',
+        vault_name: str = '',
+        category: str = '',
+        state: str = 'active',
+        tags: Tuple[str, ...] = (),
+        created_at: Optional[int] = None,
+        updated_at: Optional[int] = None,
+    ):
+        self.title = title
+        self.url = url
+        self.username = username
+        self.password = password
+        self.notes = notes
+        self.otp_auth = otp_auth
+        self.uuid = uuid
+        self.vault_uuid = vault_uuid
+        self.vault_name = vault_name
+        self.category = category
+        self.state = state
+        self.tags = tags
+        self.created_at = created_at
+        self.updated_at = updated_at
+
+    def as_csv_tuple(self) -> Tuple[str, str, str, str, str, str]:
+        """依 CSV_FIELDNAMES 順序回傳 Apple CSV 欄位"""
+        return (self.title, self.url, self.username, self.password, self.notes, self.otp_auth)
+
+    def as_csv_row(self) -> Dict[str, str]:
+        """以 Apple CSV 欄位名稱為鍵回傳 dict"""
+        return dict(zip(CSV_FIELDNAMES, self.as_csv_tuple()))
+
+    # 以 tuple 序列化，送往或取回 worker 行程時不必重複夾帶屬性名稱
+    def __getstate__(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state: Tuple[Any, ...]):
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+
+def _convert_csv_fields(item: Dict[str, Any]) -> Tuple[str, str, str, str, str, str]:
+    """轉換 item 的 Apple CSV 欄位（依 CSV_FIELDNAMES 順序）"""
     overview = item.get('overview', {})
     details = item.get('details', {})
 
@@ -244,55 +1062,1495 @@ def convert_item_to_csv_row(item: Dict[str, Any]) -> Dict[str, str]:
     title = overview.get('title', '')
     url = extract_url(overview) or ''
 
-    login_fields = details.get('loginFields', [])
-    username = extract_username(login_fields) or ''
-    password = extract_password(login_fields) or ''
-
-    sections = details.get('sections', [])
-    otp_auth = extract_otp_auth(sections) or ''
-
-    notes = build_notes(details, overview)
-
-    return {
-        'Title': title,
-        'URL': url,
-        'Username': username,
-        'Password': password,
-        'Notes': notes,
-        'OTPAuth': otp_auth,
-    }
-
-
-def convert_1pux_to_csv(one_pux_path: Path, output_path: Path, include_archived: bool = False):
-    """將 1PUX 檔案轉換為 Apple CSV 格式"""
-    # 讀取 export.data
-    data = extract_export_data(one_pux_path)
-
-    # 提取所有 items
-    csv_rows = []
-    accounts = data.get('accounts', [])
-
-    for account in accounts:
-        vaults = account.get('vaults', [])
-        for vault in vaults:
-            items = vault.get('items', [])
-            for item in items:
-                # 檢查是否要包含 archived items
-                state = item.get('state', 'active')
-                if not include_archived and state == 'archived':
-                    continue
+    login_fields = classify_login_fields(details.get('loginFields', []))
+    username = login_fields.username or ''
+    password = login_fields.password or ''
+
+    section_index = index_sections(details.get('sections', []))
+    otp_auth = section_index.otp_auth or ''
+
+    with profile_stage('notes'):
+        notes = build_notes(details, overview, login_fields, section_index)
+
+    return title, url, username, password, notes, otp_auth
+
+
+def _build_converted_item(
+    csv_fields: Tuple[str, ...], item: Dict[str, Any], vault: Optional[Dict[str, Any]]
+) -> ConvertedItem:
+    """以已轉換的 CSV 欄位加上 item 與 vault 的中繼資料建立 ConvertedItem"""
+    vault_attrs = vault.get('attrs', {}) if vault else {}
+    return ConvertedItem(
+        *csv_fields,
+        uuid=item.get('uuid', ''),
+        vault_uuid=vault_attrs.get('uuid', ''),
+        vault_name=vault_attrs.get('name', ''),
+        category=item.get('categoryUuid', ''),
+        state=item.get('state', 'active'),
+        tags=tuple(item.get('overview', {}).get('tags', [])),
+        created_at=item.get('createdAt'),
+        updated_at=item.get('updatedAt'),
+    )
+
+
+def convert_item(item: Dict[str, Any], vault: Optional[Dict[str, Any]] = None) -> ConvertedItem:
+    """將 1PUX item 轉換為 ConvertedItem，vault 用於填入 vault 名稱與 uuid"""
+    return _build_converted_item(_convert_csv_fields(item), item, vault)
+
+
+def convert_item_to_csv_row(item: Dict[str, Any]) -> Dict[str, str]:
+    """將 1PUX item 轉換為 CSV 行"""
+    return dict(zip(CSV_FIELDNAMES, _convert_csv_fields(item)))
+
+
+def convert_item_to_csv_tuple(item: Dict[str, Any]) -> Tuple[str, str, str, str, str, str]:
+    """將 1PUX item 轉換為依 CSV_FIELDNAMES 順序排列的 tuple，可直接交給 csv.writer"""
+    return _convert_csv_fields(item)
+
+
+def iter_included_items(
+    one_pux_path: OnePuxSource,
+    include_archived: bool = False,
+    export_filter: Optional[ExportFilter] = None,
+) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """逐一產生需要轉換的 (vault, item)
+
+    預設排除已歸檔項目；export_filter 指定 states 時改以其為準。
+    """
+    skip_archived = not include_archived and not (export_filter and export_filter.states)
+    for _account, vault, item in iter_export_items(one_pux_path, export_filter=export_filter):
+        # 檢查是否要包含 archived items
+        if skip_archived and item.get('state', 'active') == 'archived':
+            continue
+        yield vault, item
+
+
+class OutputOptions(NamedTuple):
+    """輸出檔的緩衝與同步策略"""
+    # 累積多少位元組後才一次寫入檔案
+    buffer_size: int = OUTPUT_BUFFER_SIZE
+    # none：不呼叫 fsync；close：關閉前 fsync 一次；flush：每次大量寫入後都 fsync
+    fsync: str = 'none'
+    # 寫入後以 posix_fadvise(DONTNEED) 釋放頁面快取，避免大型輸出擠掉其他快取
+    drop_cache: bool = False
+    # gzip、xz、zstd 或 none；None 表示依輸出檔的副檔名決定
+    compression: Optional[str] = None
+
+
+class PolicyFileIO(io.FileIO):
+    """在每次大量寫入後套用 fsync 與 posix_fadvise 策略的 FileIO"""
+
+    def __init__(
+        self, path: Union[Path, int], mode: str, options: OutputOptions, closefd: bool = True
+    ):
+        super().__init__(path, mode, closefd)
+        self._options = options
+        self._drop_cache = options.drop_cache and hasattr(os, 'posix_fadvise')
+        if self._drop_cache:
+            os.posix_fadvise(self.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+    def write(self, data) -> int:
+        offset = self.tell() if self._drop_cache else 0
+        written = super().write(data)
+        if self._options.fsync == 'flush':
+            os.fsync(self.fileno())
+        if self._drop_cache and written:
+            # 只有已寫回磁碟的頁面會被釋放，未 fsync 的部分由系統稍後處理
+            os.posix_fadvise(self.fileno(), offset, written, os.POSIX_FADV_DONTNEED)
+        return written
+
+    def close(self):
+        if not self.closed and self._options.fsync != 'none':
+            os.fsync(self.fileno())
+        super().close()
+
+
+def output_compression(output_path: Path, options: OutputOptions) -> Optional[str]:
+    """決定輸出檔使用的壓縮格式，未壓縮時回傳 None"""
+    if options.compression is not None:
+        return None if options.compression == 'none' else options.compression
+    for compression, suffix in COMPRESSION_SUFFIXES.items():
+        if output_path.suffix.lower() == suffix:
+            return compression
+    return None
+
+
+def compressed_suffix(options: Optional[OutputOptions]) -> str:
+    """明確指定壓縮格式時，預設輸出檔名需要附加的副檔名"""
+    if options is None or options.compression in (None, 'none'):
+        return ''
+    return COMPRESSION_SUFFIXES[options.compression]
+
+
+def _make_compressor(compression: str) -> Any:
+    """建立具有 compress(data) 與 flush() 的增量壓縮器"""
+    if compression == 'gzip':
+        # wbits=31 產生含標頭與 CRC 的 gzip 格式
+        return zlib.compressobj(6, zlib.DEFLATED, 31)
+    if compression == 'xz':
+        return lzma.LZMACompressor()
+    if compression == 'zstd':
+        if zstandard is None:
+            raise ValueError("輸出 zstd 需要安裝 zstandard 套件（pip install zstandard）")
+        return zstandard.ZstdCompressor().compressobj()
+    raise ValueError(f"不支援的壓縮格式: {compression}")
+
+
+class BackgroundCompressor(io.RawIOBase):
+    """在背景執行緒壓縮並寫入輸出檔，讓壓縮與轉換同時進行
+
+    每次 write 收到的是 BufferedWriter 累積的一整塊資料；佇列長度有上限，
+    壓縮跟不上時會暫停寫入端，記憶體用量不會無限增加。
+    """
+
+    def __init__(self, raw: io.RawIOBase, compressor: Any, max_pending: int = 2):
+        super().__init__()
+        self._raw = raw
+        self._compressor = compressor
+        self._pending: queue.Queue = queue.Queue(max_pending)
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name='output-compressor', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while (data := self._pending.get()) is not None:
+            if self._error:
+                continue
+            try:
+                self._raw.write(self._compressor.compress(data))
+            except BaseException as e:
+                self._error = e
+
+    def _raise_error(self):
+        if self._error:
+            raise self._error
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._raise_error()
+        # BufferedWriter 會重複使用自己的緩衝區，因此需要複製一份交給背景執行緒
+        self._pending.put(bytes(data))
+        return len(data)
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            self._pending.put(None)
+            self._thread.join()
+            self._raise_error()
+            self._raw.write(self._compressor.flush())
+        finally:
+            self._raw.close()
+            super().close()
+
+
+def open_output(
+    output_path: Path,
+    append: bool = False,
+    encoding: str = 'utf-8-sig',
+    options: Optional[OutputOptions] = None,
+) -> TextIO:
+    """開啟文字輸出檔，寫入的內容會先累積到 options.buffer_size 再一次寫出
+
+    output_path 為 - 時寫入 stdout；附加模式下不會重複寫入 BOM。輸出為 .gz、.xz、.zst
+    或 options.compression 指定格式時，在背景執行緒中壓縮。
+    """
+    options = options or OutputOptions()
+    if options.fsync not in ('none', 'close', 'flush'):
+        raise ValueError(f"不支援的 fsync 策略: {options.fsync}")
+
+    # 先建立壓縮器，缺少 zstandard 時不會留下空的輸出檔
+    compression = output_compression(output_path, options)
+    compressor = _make_compressor(compression) if compression else None
+
+    if output_path == STDIO_PATH:
+        # 先送出已緩衝的訊息，stdout 可能是管線，不套用 fsync 與 fadvise
+        sys.stdout.flush()
+        raw = PolicyFileIO(
+            sys.stdout.fileno(), 'w', options._replace(fsync='none', drop_cache=False),
+            closefd=False,
+        )
+    else:
+        raw = PolicyFileIO(output_path, 'a' if append else 'w', options)
+
+    if compressor:
+        raw = BackgroundCompressor(raw, compressor)
+    buffered = io.BufferedWriter(raw, buffer_size=options.buffer_size)
+    if append and encoding == 'utf-8-sig':
+        encoding = 'utf-8'
+    return io.TextIOWrapper(buffered, encoding=encoding, newline='')
+
+
+def safe_file_name(name: str, default: str) -> str:
+    """將任意字串轉為不含路徑分隔字元的安全檔名"""
+    return re.sub(r'[^\w.\- ]+', '_', name or default).strip(' .') or default
+
 
-                csv_row = convert_item_to_csv_row(item)
-                csv_rows.append(csv_row)
+def remove_output(output_path: Path):
+    """刪除不完整的輸出檔；stdout 無法收回，/dev/null 這類特殊檔案也不能刪除"""
+    if output_path != STDIO_PATH and output_path.is_file():
+        output_path.unlink(missing_ok=True)
 
-    # 寫入 CSV（使用 UTF-8 with BOM 以確保 Excel 正確顯示）
-    with open(output_path, 'w', encoding='utf-8-sig', newline='') as f:
-        fieldnames = ['Title', 'URL', 'Username', 'Password', 'Notes', 'OTPAuth']
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(csv_rows)
 
-    print(f"成功轉換 {len(csv_rows)} 筆記錄到 {output_path}")
+def same_file(output_path: Path, source: OnePuxSource) -> bool:
+    """判斷輸出路徑是否指向輸入檔（含符號連結與硬連結），stdin／stdout 不比較"""
+    if output_path == STDIO_PATH or not isinstance(source, Path):
+        return False
+    if output_path.resolve() == source.resolve():
+        return True
+    try:
+        return os.path.samefile(output_path, source)
+    except OSError:
+        return False
+
+
+def check_output_paths(output_paths: Iterable[Path], sources: Iterable[OnePuxSource]):
+    """開啟任何輸出之前確認輸出路徑不是輸入檔，避免輸入在讀取前就被覆寫或刪除"""
+    sources = list(sources)
+    for output_path in output_paths:
+        for source in sources:
+            if same_file(output_path, source):
+                raise ValueError(f"輸出檔與輸入檔相同: {output_path}")
+
+
+def check_distinct_outputs(output_paths: Sequence[Path]):
+    """確認多個輸出不會寫入同一個檔案（含 stdout），否則彼此會互相覆蓋"""
+    for index, output_path in enumerate(output_paths):
+        for other in output_paths[:index]:
+            if output_path == other or same_file(output_path, other):
+                raise ValueError(f"多個輸出寫入同一個檔案: {output_path}")
+
+
+def write_csv_tuples(
+    output_path: Path,
+    csv_rows: Iterable[Sequence[str]],
+    fieldnames: Sequence[str] = CSV_FIELDNAMES,
+    output_options: Optional[OutputOptions] = None,
+) -> int:
+    """以 csv.writer 逐筆寫入依 fieldnames 順序排列的 tuple，回傳寫入的筆數
+
+    不經過 DictWriter 的 dict 對應與鍵檢查。
+    """
+    count = 0
+    try:
+        # 使用 UTF-8 with BOM 以確保 Excel 正確顯示
+        with open_output(output_path, options=output_options) as f:
+            writer = csv.writer(f)
+            writer.writerow(fieldnames)
+            for csv_row in csv_rows:
+                with profile_stage('write'):
+                    writer.writerow(csv_row)
+                count += 1
+    except BaseException:
+        # 轉換中途失敗時不留下不完整的輸出檔
+        remove_output(output_path)
+        raise
+
+    return count
+
+
+def write_csv_rows(
+    output_path: Path,
+    csv_rows: Iterable[Dict[str, str]],
+    fieldnames: List[str] = CSV_FIELDNAMES,
+    output_options: Optional[OutputOptions] = None,
+) -> int:
+    """逐筆寫入以欄位名稱為鍵的 dict，回傳寫入的筆數"""
+    return write_csv_tuples(
+        output_path,
+        ([csv_row.get(name, '') for name in fieldnames] for csv_row in csv_rows),
+        fieldnames,
+        output_options,
+    )
+
+
+class OutputSink(abc.ABC):
+    """接收 ConvertedItem 的輸出格式，以 register_output_format 註冊後即可用於 --sink
+
+    子類別至少需實作 write()，未實作時在建立時就會失敗，不會先開啟輸出檔。
+    """
+    encoding = 'utf-8-sig'
+
+    def __init__(self, output_path: Path, output_options: Optional[OutputOptions] = None):
+        self.output_path = output_path
+        self.count = 0
+        self._file = self.open(output_options)
+        self.begin()
+
+    def open(self, output_options: Optional[OutputOptions]) -> Any:
+        """開啟輸出檔，回傳的物件需提供 close()"""
+        return open_output(self.output_path, encoding=self.encoding, options=output_options)
+
+    def begin(self):
+        """寫入檔頭"""
+
+    @abc.abstractmethod
+    def write(self, converted: ConvertedItem):
+        """寫入一個項目"""
+
+    def end(self):
+        """寫入檔尾"""
+
+    def close(self):
+        try:
+            self.end()
+        finally:
+            self._file.close()
+
+    def abort(self):
+        """轉換失敗時關閉並刪除不完整的輸出檔"""
+        with suppress(Exception):
+            self._file.close()
+        remove_output(self.output_path)
+
+
+# 輸出格式名稱 → OutputSink 類別
+OUTPUT_FORMATS: Dict[str, Type[OutputSink]] = {}
+
+
+def register_output_format(name: str) -> Callable[[Type[OutputSink]], Type[OutputSink]]:
+    """註冊輸出格式的 decorator，重複註冊會覆蓋原本的類別"""
+    def register(sink_class: Type[OutputSink]) -> Type[OutputSink]:
+        OUTPUT_FORMATS[name] = sink_class
+        return sink_class
+    return register
+
+
+class CsvSink(OutputSink):
+    """以 fieldnames 為表頭、每個項目一行的 CSV 輸出"""
+    fieldnames: Sequence[str] = CSV_FIELDNAMES
+
+    def begin(self):
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.fieldnames)
+
+    @abc.abstractmethod
+    def row(self, converted: ConvertedItem) -> Sequence[str]:
+        """回傳項目對應的 CSV 欄位"""
+
+    def write(self, converted: ConvertedItem):
+        self._writer.writerow(self.row(converted))
+        self.count += 1
+
+
+@register_output_format('apple-csv')
+class AppleCsvSink(CsvSink):
+    """Apple 密碼（iCloud 鑰匙圈）匯入用的 CSV"""
+
+    def row(self, converted: ConvertedItem) -> Sequence[str]:
+        return converted.as_csv_tuple()
+
+
+@register_output_format('chrome-csv')
+class ChromeCsvSink(CsvSink):
+    """Chrome 與 Edge 密碼管理工具匯入用的 CSV"""
+    encoding = 'utf-8'
+    fieldnames = ['name', 'url', 'username', 'password', 'note']
+
+    def row(self, converted: ConvertedItem) -> Sequence[str]:
+        return (
+            converted.title, converted.url, converted.username, converted.password,
+            converted.notes,
+        )
+
+
+@register_output_format('keepass-csv')
+class KeePassCsvSink(CsvSink):
+    """KeePass／KeePassXC 匯入用的 CSV，以 vault 名稱作為群組"""
+    fieldnames = ['Group', 'Title', 'Username', 'Password', 'URL', 'Notes', 'TOTP']
+
+    def row(self, converted: ConvertedItem) -> Sequence[str]:
+        return (
+            converted.vault_name, converted.title, converted.username, converted.password,
+            converted.url, converted.notes, converted.otp_auth,
+        )
+
+
+@register_output_format('bitwarden-json')
+class BitwardenJsonSink(OutputSink):
+    """Bitwarden 未加密 JSON 匯出格式，以 vault 作為資料夾
+
+    items 逐筆寫出，資料夾清單在最後才寫入，不需先讀完整份匯出。
+    """
+    encoding = 'utf-8'
+
+    def begin(self):
+        self._folders: Dict[str, str] = {}
+        self._file.write('{"encrypted": false, "items": [')
+
+    def write(self, converted: ConvertedItem):
+        folder_id = converted.vault_uuid or None
+        if folder_id and folder_id not in self._folders:
+            self._folders[folder_id] = converted.vault_name or folder_id
+
+        entry = {
+            'id': converted.uuid or None,
+            'folderId': folder_id,
+            'type': 1,
+            'name': converted.title,
+            'notes': converted.notes or None,
+            'favorite': False,
+            'login': {
+                'uris': [{'match': None, 'uri': converted.url}] if converted.url else [],
+                'username': converted.username or None,
+                'password': converted.password or None,
+                'totp': converted.otp_auth or None,
+            },
+        }
+        self._file.write(',\n' if self.count else '\n')
+        self._file.write(json.dumps(entry, ensure_ascii=False))
+        self.count += 1
+
+    def end(self):
+        folders = [{'id': folder_id, 'name': name} for folder_id, name in self._folders.items()]
+        self._file.write(f'\n], "folders": {json.dumps(folders, ensure_ascii=False)}}}\n')
+
+
+@register_output_format('parquet')
+class ParquetSink(OutputSink):
+    """Parquet 欄式輸出（需要 pyarrow），每累積 row_group_size 筆寫出一個 row group
+
+    除 Apple CSV 欄位外另含 vault、分類、uuid 與時間欄位，vault 與分類以 dictionary 編碼。
+    """
+    row_group_size = PARQUET_ROW_GROUP_SIZE
+
+    def open(self, output_options: Optional[OutputOptions]) -> Any:
+        if pyarrow is None:
+            raise ValueError("輸出 Parquet 需要安裝 pyarrow 套件（pip install pyarrow）")
+        if self.output_path == STDIO_PATH:
+            raise ValueError("Parquet 輸出無法寫入 stdout")
+
+        dictionary = pyarrow.dictionary(pyarrow.int32(), pyarrow.string())
+        self._schema = pyarrow.schema(
+            [(name, pyarrow.string()) for name in CSV_FIELDNAMES] + [
+                ('Vault', dictionary),
+                ('VaultUUID', dictionary),
+                ('Category', dictionary),
+                ('UUID', pyarrow.string()),
+                ('CreatedAt', pyarrow.timestamp('s')),
+                ('UpdatedAt', pyarrow.timestamp('s')),
+            ]
+        )
+        return pyarrow.parquet.ParquetWriter(self.output_path, self._schema, compression='zstd')
+
+    def begin(self):
+        self._columns: Dict[str, list] = {name: [] for name in self._schema.names}
+
+    def write(self, converted: ConvertedItem):
+        for name, value in zip(CSV_FIELDNAMES, converted.as_csv_tuple()):
+            self._columns[name].append(value)
+        self._columns['Vault'].append(converted.vault_name)
+        self._columns['VaultUUID'].append(converted.vault_uuid)
+        self._columns['Category'].append(converted.category)
+        self._columns['UUID'].append(converted.uuid)
+        self._columns['CreatedAt'].append(converted.created_at)
+        self._columns['UpdatedAt'].append(converted.updated_at)
+        self.count += 1
+        if len(self._columns['UUID']) >= self.row_group_size:
+            self._write_row_group()
+
+    def _write_row_group(self):
+        table = pyarrow.Table.from_pydict(self._columns, schema=self._schema)
+        self._file.write_table(table, row_group_size=self.row_group_size)
+        for values in self._columns.values():
+            values.clear()
+
+    def end(self):
+        if self._columns['UUID'] or not self.count:
+            self._write_row_group()
+
+
+def url_host(url: str) -> str:
+    """取得 URL 的主機名稱（小寫），無法解析時回傳空字串"""
+    try:
+        return urllib.parse.urlsplit(url if '//' in url else f'//{url}').hostname or ''
+    except ValueError:
+        return ''
+
+
+@register_output_format('sqlite')
+class SqliteSink(OutputSink):
+    """可查詢的 SQLite 資料庫輸出，以 executemany 分批寫入後才建立索引
+
+    先在單一交易中寫入所有資料，最後一次建立 title、URL 主機、username、vault 與 uuid 的索引，
+    比逐筆寫入並同時維護索引快得多。資料庫先寫入同一目錄下的暫存檔，完成後才取代輸出路徑，
+    失敗時原本的檔案不受影響。
+    """
+    fts = False
+
+    def open(self, output_options: Optional[OutputOptions]) -> Any:
+        if self.output_path == STDIO_PATH:
+            raise ValueError("SQLite 輸出無法寫入 stdout")
+
+        fd, temp_name = tempfile.mkstemp(
+            prefix=f'.{self.output_path.name}.', suffix='.tmp', dir=self.output_path.parent
+        )
+        os.close(fd)
+        self._temp_path = Path(temp_name)
+        try:
+            connection = sqlite3.connect(self._temp_path, isolation_level=None)
+        except BaseException:
+            remove_output(self._temp_path)
+            raise
+        try:
+            if self.fts and not connection.execute(
+                "SELECT sqlite_compileoption_used('ENABLE_FTS5')"
+            ).fetchone()[0]:
+                raise ValueError("此 Python 的 SQLite 不支援 FTS5")
+            # 失敗時整個檔案會被刪除，因此載入期間不需要 rollback journal
+            connection.execute("PRAGMA journal_mode = OFF")
+            fsync = output_options.fsync if output_options else 'none'
+            connection.execute(f"PRAGMA synchronous = {'OFF' if fsync == 'none' else 'FULL'}")
+        except BaseException:
+            connection.close()
+            remove_output(self._temp_path)
+            raise
+        return connection
+
+    def begin(self):
+        self._file.execute(
+            """CREATE TABLE items (
+                uuid TEXT,
+                vault_uuid TEXT,
+                vault TEXT,
+                category TEXT,
+                title TEXT,
+                url TEXT,
+                url_host TEXT,
+                username TEXT,
+                password TEXT,
+                notes TEXT,
+                otp_auth TEXT,
+                tags TEXT,
+                created_at INTEGER,
+                updated_at INTEGER
+            )"""
+        )
+        self._file.execute("BEGIN")
+        self._rows: List[tuple] = []
+
+    def write(self, converted: ConvertedItem):
+        self._rows.append((
+            converted.uuid, converted.vault_uuid, converted.vault_name, converted.category,
+            converted.title, converted.url, url_host(converted.url), converted.username,
+            converted.password, converted.notes, converted.otp_auth, ', '.join(converted.tags),
+            converted.created_at, converted.updated_at,
+        ))
+        self.count += 1
+        if len(self._rows) >= SQLITE_BATCH_SIZE:
+            self._insert_rows()
+
+    def _insert_rows(self):
+        self._file.executemany(
+            "INSERT INTO items VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", self._rows
+        )
+        self._rows.clear()
+
+    def end(self):
+        self._insert_rows()
+        for column in ('title', 'url_host', 'username', 'vault', 'uuid'):
+            self._file.execute(f"CREATE INDEX items_{column} ON items ({column})")
+        if self.fts:
+            self._file.execute(
+                "CREATE VIRTUAL TABLE items_fts USING fts5("
+                "title, notes, content='items', content_rowid='rowid')"
+            )
+            self._file.execute("INSERT INTO items_fts(items_fts) VALUES ('rebuild')")
+        self._file.execute("COMMIT")
+        self._file.execute("ANALYZE")
+
+    def close(self):
+        super().close()
+        os.replace(self._temp_path, self.output_path)
+        # 之後其他輸出失敗而呼叫 abort 時，刪除的是已完成的輸出
+        self._temp_path = self.output_path
+
+    def abort(self):
+        """刪除暫存檔，尚未完成時輸出路徑上原本的檔案保持不變"""
+        with suppress(Exception):
+            self._file.close()
+        remove_output(self._temp_path)
+
+
+@register_output_format('sqlite-fts')
+class SqliteFtsSink(SqliteSink):
+    """SQLite 輸出，另外建立 title 與 notes 的 FTS5 全文檢索"""
+    fts = True
+
+
+def open_sinks(
+    targets: Sequence[Tuple[str, Path]],
+    output_options: Optional[OutputOptions] = None,
+    sources: Iterable[OnePuxSource] = (),
+) -> List[OutputSink]:
+    """依 (格式名稱, 輸出路徑) 開啟所有輸出，任何一個失敗時刪除已開啟的輸出
+
+    開啟前先拒絕重複的輸出路徑，以及與 sources 中任一輸入相同的輸出路徑。
+    """
+    output_paths = [output_path for _, output_path in targets]
+    check_distinct_outputs(output_paths)
+    check_output_paths(output_paths, sources)
+
+    sinks: List[OutputSink] = []
+    try:
+        for format_name, output_path in targets:
+            sink_class = OUTPUT_FORMATS.get(format_name)
+            if sink_class is None:
+                raise ValueError(f"不支援的輸出格式: {format_name}")
+            sinks.append(sink_class(output_path, output_options))
+    except BaseException:
+        for sink in sinks:
+            sink.abort()
+        raise
+    return sinks
+
+
+def write_to_sinks(converted_items: Iterable[ConvertedItem], sinks: Sequence[OutputSink]) -> int:
+    """將每個轉換後的項目同時寫入所有輸出，回傳筆數；失敗時刪除所有輸出檔"""
+    count = 0
+    try:
+        for converted in converted_items:
+            with profile_stage('write'):
+                for sink in sinks:
+                    sink.write(converted)
+            count += 1
+        for sink in sinks:
+            sink.close()
+    except BaseException:
+        for sink in sinks:
+            sink.abort()
+        raise
+    return count
+
+
+# 送往行程池轉換的 (vault, item)
+VaultItem = Tuple[Optional[Dict[str, Any]], Dict[str, Any]]
+
+def item_digest(item: Dict[str, Any]) -> str:
+    """計算 item JSON 內容的雜湊，用於判斷項目是否有變更"""
+    canonical = json.dumps(item, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.blake2b(canonical.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class RowCache:
+    """以 item uuid 與版本鍵為鍵，將已轉換的 CSV 行保存在 SQLite 檔案中
+
+    版本鍵預設為 updatedAt（沒有 updatedAt 時改用內容雜湊）；key='content' 則一律使用
+    內容雜湊，較保守但計算成本與轉換本身相近。版本鍵相同的 item 直接使用快取結果，
+    不再重新轉換。註冊自訂欄位格式化函數後請改用新的快取檔，
+    否則舊結果仍會被沿用。
+    """
+
+    _COLUMNS = ', '.join(f'"{name}"' for name in CSV_FIELDNAMES)
+
+    def __init__(self, path: Path, key: str = 'updatedAt'):
+        if key not in ('updatedAt', 'content'):
+            raise ValueError(f"不支援的快取鍵: {key}")
+        self.path = path
+        self.key = key
+        self.hits = 0
+        self.misses = 0
+        self._seen: set = set()
+        self._conn = sqlite3.connect(path)
+        self._conn.executescript(f"""
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS rows (
+                uuid TEXT PRIMARY KEY,
+                digest TEXT NOT NULL,
+                {', '.join(f'"{name}" TEXT NOT NULL' for name in CSV_FIELDNAMES)}
+            );
+        """)
+
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if row is None or row[0] != str(ROW_CACHE_VERSION):
+            self._conn.execute("DELETE FROM rows")
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)",
+                (str(ROW_CACHE_VERSION),),
+            )
+
+    def _digest(self, item: Dict[str, Any]) -> str:
+        updated_at = item.get('updatedAt') if self.key == 'updatedAt' else None
+        return f'updatedAt:{updated_at}' if updated_at else item_digest(item)
+
+    def lookup_many(
+        self, items: Sequence[Dict[str, Any]]
+    ) -> List[Tuple[Optional[str], str, Optional[Tuple[str, ...]]]]:
+        """以一次查詢取得一批 items 的快取，依原始順序回傳 (uuid, digest, 快取的 CSV 欄位或 None)"""
+        keys = [(item.get('uuid'), self._digest(item)) for item in items]
+        uuids = list({uuid for uuid, _ in keys if uuid})
+        self._seen.update(uuids)
+
+        cached: Dict[str, Tuple[str, Tuple[str, ...]]] = {}
+        # 每次查詢的參數數量低於 SQLite 的上限
+        for chunk in itertools.batched(uuids, JOBS_BATCH_SIZE):
+            for uuid, digest, *csv_fields in self._conn.execute(
+                f"SELECT uuid, digest, {self._COLUMNS} FROM rows "
+                f"WHERE uuid IN ({', '.join('?' * len(chunk))})",
+                chunk,
+            ):
+                cached[uuid] = (digest, tuple(csv_fields))
+
+        results = []
+        for uuid, digest in keys:
+            entry = cached.get(uuid) if uuid else None
+            if entry is not None and entry[0] == digest:
+                self.hits += 1
+                results.append((uuid, digest, entry[1]))
+            else:
+                self.misses += 1
+                results.append((uuid, digest, None))
+        return results
+
+    def lookup(self, item: Dict[str, Any]) -> Tuple[Optional[str], str, Optional[Tuple[str, ...]]]:
+        """查詢單一 item 的快取，回傳 (uuid, digest, 快取的 CSV 欄位或 None)"""
+        return self.lookup_many([item])[0]
+
+    def store_many(self, entries: Iterable[Tuple[Optional[str], str, ConvertedItem]]):
+        """保存 (uuid, digest, 轉換結果)，沒有 uuid 的 item 不會被快取"""
+        self._conn.executemany(
+            f"INSERT OR REPLACE INTO rows (uuid, digest, {self._COLUMNS}) "
+            f"VALUES (?, ?, {', '.join('?' * len(CSV_FIELDNAMES))})",
+            ((uuid, digest, *converted.as_csv_tuple()) for uuid, digest, converted in entries if uuid),
+        )
+
+    def store(self, uuid: Optional[str], digest: str, converted: ConvertedItem):
+        """保存轉換結果，沒有 uuid 的 item 不會被快取"""
+        self.store_many([(uuid, digest, converted)])
+
+    def convert_batch(self, items: Sequence[VaultItem]) -> List[ConvertedItem]:
+        """轉換一批 (vault, item)，優先使用快取結果，未命中的轉換後寫入快取"""
+        results = []
+        misses = []
+        for (vault, item), (uuid, digest, csv_fields) in zip(
+            items, self.lookup_many([item for _, item in items])
+        ):
+            if csv_fields is not None:
+                results.append(_build_converted_item(csv_fields, item, vault))
+            else:
+                converted = convert_item(item, vault)
+                misses.append((uuid, digest, converted))
+                results.append(converted)
+        self.store_many(misses)
+        return results
+
+    def convert(self, item: Dict[str, Any], vault: Optional[Dict[str, Any]] = None) -> ConvertedItem:
+        """優先使用快取結果，未命中時轉換並寫入快取"""
+        return self.convert_batch([(vault, item)])[0]
+
+    def prune_unseen(self) -> int:
+        """刪除本次執行中沒有出現的 item，回傳刪除的筆數"""
+        self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS seen (uuid TEXT PRIMARY KEY)")
+        self._conn.execute("DELETE FROM seen")
+        self._conn.executemany("INSERT INTO seen (uuid) VALUES (?)", ((u,) for u in self._seen))
+        cursor = self._conn.execute("DELETE FROM rows WHERE uuid NOT IN (SELECT uuid FROM seen)")
+        return cursor.rowcount
+
+    def close(self):
+        self._conn.commit()
+        self._conn.close()
+
+    def __enter__(self) -> 'RowCache':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self._conn.rollback()
+        self.close()
+
+
+def process_pool(max_workers: int, **kwargs) -> ProcessPoolExecutor:
+    """建立不使用 fork 的行程池
+
+    主行程可能已有背景壓縮或附件擷取的執行緒，fork 這類多執行緒行程可能讓子行程死結，
+    因此使用 forkserver（不支援時使用 spawn）；worker 會重新匯入本模組。
+    """
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=context, **kwargs)
+
+
+def _init_worker():
+    """worker 行程初始化：不沿用主行程的量測狀態"""
+    global _active_profiler
+    _active_profiler = None
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+# 批次中每個 item 的快取查詢結果：((vault, item), uuid, digest, 快取的 CSV 欄位或 None)
+CacheLookup = Tuple[VaultItem, Optional[str], str, Optional[Tuple[str, ...]]]
+
+
+def _convert_batch(items: Tuple[VaultItem, ...]) -> List[ConvertedItem]:
+    """在 worker 行程中轉換一批 items"""
+    return [convert_item(item, vault) for vault, item in items]
+
+
+def _submit_batch(
+    executor: ProcessPoolExecutor, batch: Tuple[VaultItem, ...], cache: Optional[RowCache]
+) -> Tuple[Optional[List[CacheLookup]], Optional[Future]]:
+    """查詢快取後只把未命中的 items 送往行程池"""
+    if cache is None:
+        return None, executor.submit(_convert_batch, batch)
+
+    lookups = [
+        (vault_item, *cached)
+        for vault_item, cached in zip(batch, cache.lookup_many([item for _, item in batch]))
+    ]
+    misses = tuple(vault_item for vault_item, _, _, csv_fields in lookups if csv_fields is None)
+    return lookups, executor.submit(_convert_batch, misses) if misses else None
+
+
+def _collect_batch(
+    lookups: Optional[List[CacheLookup]],
+    future: Optional[Future],
+    cache: Optional[RowCache],
+) -> List[ConvertedItem]:
+    """等待批次結果，並依原始順序與快取命中的結果合併"""
+    with profile_stage('convert'):
+        converted = future.result() if future else []
+    if lookups is None:
+        return converted
+
+    results = []
+    stored = []
+    converted_items = iter(converted)
+    for (vault, item), uuid, digest, csv_fields in lookups:
+        if csv_fields is None:
+            result = next(converted_items)
+            stored.append((uuid, digest, result))
+        else:
+            result = _build_converted_item(csv_fields, item, vault)
+        results.append(result)
+    cache.store_many(stored)
+    return results
+
+
+def convert_items(
+    items: Iterable[VaultItem],
+    jobs: int = 1,
+    batch_size: int = JOBS_BATCH_SIZE,
+    cache: Optional[RowCache] = None,
+) -> Iterator[ConvertedItem]:
+    """轉換 (vault, item) 為 ConvertedItem，jobs > 1 時分批交給行程池處理並維持原始順序
+
+    提供 cache 時，內容未變更的 items 直接使用快取結果。
+    """
+    if jobs <= 1 and cache:
+        # 以批次查詢快取，避免每個 item 一次 SELECT
+        for batch in itertools.batched(items, CACHE_BATCH_SIZE):
+            with profile_stage('convert'):
+                converted = cache.convert_batch(batch)
+            yield from converted
+        return
+
+    if jobs <= 1:
+        for vault, item in items:
+            with profile_stage('convert'):
+                converted = convert_item(item, vault)
+            yield converted
+        return
+
+    with process_pool(jobs, initializer=_init_worker) as executor:
+        pending = deque()
+        for batch in itertools.batched(items, batch_size):
+            pending.append(_submit_batch(executor, batch, cache))
+            # 限制進行中的批次數，避免讀取速度超過轉換速度時佔用過多記憶體
+            if len(pending) >= jobs * 2:
+                yield from _collect_batch(*pending.popleft(), cache)
+
+        while pending:
+            yield from _collect_batch(*pending.popleft(), cache)
+
+
+class AttachmentRef(NamedTuple):
+    """item 中參照的一個附件或文件"""
+    document_id: str
+    file_name: str
+
+
+def iter_attachment_refs(item: Dict[str, Any]) -> Iterator[AttachmentRef]:
+    """逐一產生 item 的 documentAttributes 與 section 中 file 欄位參照的附件"""
+    details = item.get('details', {})
+    document = details.get('documentAttributes')
+    if document and document.get('documentId'):
+        yield AttachmentRef(document['documentId'], document.get('fileName', ''))
+
+    for section in details.get('sections', []):
+        for field in section.get('fields', []):
+            value = field.get('value')
+            file_ref = value.get('file') if isinstance(value, dict) else None
+            if isinstance(file_ref, dict) and file_ref.get('documentId'):
+                yield AttachmentRef(file_ref['documentId'], file_ref.get('fileName', ''))
+
+
+def index_attachment_members(zip_file: zipfile.ZipFile) -> Dict[str, zipfile.ZipInfo]:
+    """以 documentId 建立 files/ 目錄下附件成員的索引"""
+    index: Dict[str, zipfile.ZipInfo] = {}
+    for info in zip_file.infolist():
+        if info.filename.startswith(ATTACHMENTS_DIR_NAME) and not info.is_dir():
+            document_id = info.filename[len(ATTACHMENTS_DIR_NAME):].partition('__')[0]
+            index.setdefault(document_id, info)
+    return index
+
+
+class AttachmentExtractor:
+    """在轉換的同一輪讀取中，以執行緒池將 items 參照的附件串流寫入 output_dir
+
+    附件寫入 output_dir/<item uuid>/<fileName>，同一 item 中檔名重複時加上 documentId。
+    進行中的寫入數有上限，讀取速度超過磁碟寫入時會暫停讀取。
+    """
+
+    def __init__(self, one_pux_path: Path, output_dir: Path, max_workers: int = 4):
+        check_input_exists(one_pux_path)
+        self.output_dir = output_dir
+        self.extracted = 0
+        self.bytes_written = 0
+        self.missing: List[AttachmentRef] = []
+        self._max_workers = max_workers
+        self._zip_file = zipfile.ZipFile(one_pux_path, 'r')
+        self._members = index_attachment_members(self._zip_file)
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix='attachment')
+        self._pending: deque = deque()
+
+    def _copy(self, info: zipfile.ZipInfo, destination: Path) -> int:
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        # ZipFile 以鎖保護共用的檔案位置，解壓縮與寫入則可在各執行緒中同時進行
+        with self._zip_file.open(info) as src, open(destination, 'wb') as dst:
+            shutil.copyfileobj(src, dst, 1024 * 1024)
+        return info.file_size
+
+    def _collect(self, future: Future):
+        self.bytes_written += future.result()
+        self.extracted += 1
+
+    def extract(self, item: Dict[str, Any]):
+        """送出 item 參照的附件，回傳前不會等待寫入完成"""
+        used_names = set()
+        item_dir = self.output_dir / safe_file_name(item.get('uuid', ''), 'item')
+        for ref in iter_attachment_refs(item):
+            info = self._members.get(ref.document_id)
+            if info is None:
+                self.missing.append(ref)
+                continue
+
+            name = safe_file_name(ref.file_name, ref.document_id)
+            if name in used_names:
+                name = f"{Path(name).stem} ({ref.document_id}){Path(name).suffix}"
+            used_names.add(name)
+
+            self._pending.append(self._executor.submit(self._copy, info, item_dir / name))
+            if len(self._pending) >= self._max_workers * 2:
+                self._collect(self._pending.popleft())
+
+    def extract_from(self, items: Iterable[VaultItem]) -> Iterator[VaultItem]:
+        """原樣轉發 (vault, item)，並在途中送出各 item 的附件"""
+        for vault, item in items:
+            self.extract(item)
+            yield vault, item
+
+    def close(self):
+        """等待所有附件寫入完成，任何一個失敗時拋出例外"""
+        try:
+            while self._pending:
+                self._collect(self._pending.popleft())
+        finally:
+            for future in self._pending:
+                future.cancel()
+            self._executor.shutdown()
+            self._zip_file.close()
+
+    def __enter__(self) -> 'AttachmentExtractor':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type:
+            # 已經有錯誤時不再等待其他附件，只負責釋放資源
+            for future in self._pending:
+                future.cancel()
+            self._pending.clear()
+        self.close()
+
+
+def convert_1pux_to_sinks(
+    one_pux_path: OnePuxSource,
+    targets: Sequence[Tuple[str, Path]],
+    include_archived: bool = False,
+    jobs: int = 1,
+    cache: Optional[RowCache] = None,
+    output_options: Optional[OutputOptions] = None,
+    attachments: Optional[AttachmentExtractor] = None,
+    export_filter: Optional[ExportFilter] = None,
+) -> int:
+    """只解析與轉換一次，同時輸出 targets 中的每個 (格式名稱, 路徑)，回傳轉換的筆數"""
+    check_input_exists(one_pux_path)
+
+    items = iter_included_items(one_pux_path, include_archived, export_filter)
+    if attachments:
+        items = attachments.extract_from(items)
+    sinks = open_sinks(targets, output_options, [one_pux_path])
+    return write_to_sinks(convert_items(items, jobs, cache=cache), sinks)
+
+
+def convert_1pux_to_csv(
+    one_pux_path: OnePuxSource,
+    output_path: Path,
+    include_archived: bool = False,
+    jobs: int = 1,
+    cache: Optional[RowCache] = None,
+    output_options: Optional[OutputOptions] = None,
+    attachments: Optional[AttachmentExtractor] = None,
+    export_filter: Optional[ExportFilter] = None,
+) -> int:
+    """將 1PUX 檔案轉換為 Apple CSV 格式，回傳轉換的筆數
+
+    提供 attachments 時，同時擷取各 item 的附件；export_filter 用於只轉換部分項目。
+    """
+    return convert_1pux_to_sinks(
+        one_pux_path, [('apple-csv', output_path)], include_archived, jobs, cache,
+        output_options, attachments, export_filter,
+    )
+
+
+class VaultResult(NamedTuple):
+    """依 vault 分檔輸出時單一 vault 的結果"""
+    name: str
+    uuid: str
+    output_path: Path
+    count: int
+
+
+def vault_file_name(name: str, uuid: str, index: int, suffix: str = '.csv') -> str:
+    """以 vault 名稱與 uuid 組成安全的輸出檔名"""
+    return f"{safe_file_name(name, 'vault')}-{uuid or index}{suffix}"
+
+
+def convert_1pux_to_vault_csvs(
+    one_pux_path: OnePuxSource,
+    output_dir: Path,
+    include_archived: bool = False,
+    jobs: int = 1,
+    cache: Optional[RowCache] = None,
+    merged_path: Optional[Path] = None,
+    output_options: Optional[OutputOptions] = None,
+    attachments: Optional[AttachmentExtractor] = None,
+    export_filter: Optional[ExportFilter] = None,
+) -> List[VaultResult]:
+    """依 vault 分別輸出 CSV，可另外輸出合併所有 vault 的 CSV
+
+    所有 vault 的 items 共用同一個轉換串流（jobs > 1 時各 vault 的批次會同時在行程池中轉換），
+    每個 vault 的最後一筆寫出後即關閉其檔案，不需等待整份匯出轉換完成。
+    """
+    check_input_exists(one_pux_path)
+    if merged_path:
+        check_output_paths([merged_path], [one_pux_path])
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    items = iter_included_items(one_pux_path, include_archived, export_filter)
+    if attachments:
+        items = attachments.extract_from(items)
+    vault_paths: Dict[Tuple[str, str], Path] = {}
+    counts: Dict[Tuple[str, str], int] = {}
+    written: List[Path] = []
+    current_key = None
+    shard = None
+    merged = None
+    try:
+        if merged_path:
+            merged = open_output(merged_path, options=output_options)
+            written.append(merged_path)
+            merged_writer = csv.writer(merged)
+            merged_writer.writerow(CSV_FIELDNAMES)
+
+        for converted in convert_items(items, jobs, cache=cache):
+            key = (converted.vault_uuid, converted.vault_name)
+            if key != current_key:
+                if shard:
+                    shard.close()
+                # 同一個 vault 再次出現時（非標準的匯出順序）以附加模式續寫
+                if key in vault_paths:
+                    shard = open_output(vault_paths[key], append=True, options=output_options)
+                    shard_writer = csv.writer(shard)
+                else:
+                    vault_path = output_dir / vault_file_name(
+                        converted.vault_name, converted.vault_uuid, len(vault_paths),
+                        '.csv' + compressed_suffix(output_options),
+                    )
+                    check_output_paths([vault_path], [one_pux_path])
+                    vault_paths[key] = vault_path
+                    counts[key] = 0
+                    shard = open_output(vault_path, options=output_options)
+                    written.append(vault_path)
+                    shard_writer = csv.writer(shard)
+                    shard_writer.writerow(CSV_FIELDNAMES)
+                current_key = key
+
+            with profile_stage('write'):
+                csv_row = converted.as_csv_tuple()
+                shard_writer.writerow(csv_row)
+                if merged:
+                    merged_writer.writerow(csv_row)
+            counts[key] += 1
+    except BaseException:
+        # 轉換中途失敗時不留下不完整的輸出檔
+        for f in (shard, merged):
+            if f:
+                f.close()
+        for path in written:
+            remove_output(path)
+        raise
+
+    for f in (shard, merged):
+        if f:
+            f.close()
+
+    return [
+        VaultResult(name, uuid, vault_path, counts[(uuid, name)])
+        for (uuid, name), vault_path in vault_paths.items()
+    ]
+
+
+# 差異輸出 CSV 的欄位順序
+DELTA_FIELDNAMES = ['Change', 'UUID'] + CSV_FIELDNAMES
+
+
+class ItemChange(NamedTuple):
+    """兩份匯出之間單一 item 的差異"""
+    change: str  # added、modified 或 deleted
+    item: Dict[str, Any]
+
+
+def iter_item_changes(
+    old_path: OnePuxSource,
+    new_path: OnePuxSource,
+    include_archived: bool = False,
+    export_filter: Optional[ExportFilter] = None,
+) -> Iterator[ItemChange]:
+    """比較兩份 1PUX 匯出，依序產生新增、修改與刪除的 items
+
+    先以 uuid → 內容雜湊建立舊匯出的索引，再串流比對新匯出；
+    刪除的 items 需要再讀一次舊匯出才能取得內容，只有確實有刪除時才會進行。
+    """
+    old_index: Dict[str, str] = {}
+    for _vault, item in iter_included_items(old_path, include_archived, export_filter):
+        uuid = item.get('uuid')
+        if uuid:
+            old_index[uuid] = item_digest(item)
+
+    for _vault, item in iter_included_items(new_path, include_archived, export_filter):
+        uuid = item.get('uuid')
+        old_digest = old_index.pop(uuid, None) if uuid else None
+        if old_digest is None:
+            yield ItemChange('added', item)
+        elif old_digest != item_digest(item):
+            yield ItemChange('modified', item)
+
+    if old_index:
+        for _vault, item in iter_included_items(old_path, include_archived, export_filter):
+            if item.get('uuid') in old_index:
+                yield ItemChange('deleted', item)
+
+
+def _delta_rows(changes: Iterable[ItemChange], counts: Dict[str, int]) -> Iterator[Dict[str, str]]:
+    """將差異轉換為含 Change 與 UUID 欄位的 CSV 行，並統計各類差異的筆數"""
+    for change, item in changes:
+        counts[change] += 1
+        csv_row = convert_item_to_csv_row(item)
+        yield {'Change': change, 'UUID': item.get('uuid', ''), **csv_row}
+
+
+def _write_delta_json(
+    output_path: Path,
+    delta_rows: Iterable[Dict[str, str]],
+    output_options: Optional[OutputOptions] = None,
+):
+    """逐筆寫入 JSON 陣列，每筆為 {"change", "uuid", "row"}"""
+    try:
+        with open_output(output_path, encoding='utf-8', options=output_options) as f:
+            f.write('[')
+            for index, delta_row in enumerate(delta_rows):
+                entry = {
+                    'change': delta_row['Change'],
+                    'uuid': delta_row['UUID'],
+                    'row': {name: delta_row[name] for name in CSV_FIELDNAMES},
+                }
+                f.write(',\n' if index else '\n')
+                f.write(json.dumps(entry, ensure_ascii=False))
+            f.write('\n]\n')
+    except BaseException:
+        remove_output(output_path)
+        raise
+
+
+def convert_1pux_delta(
+    old_path: OnePuxSource,
+    new_path: OnePuxSource,
+    output_path: Path,
+    include_archived: bool = False,
+    output_options: Optional[OutputOptions] = None,
+    export_filter: Optional[ExportFilter] = None,
+) -> Dict[str, int]:
+    """輸出兩份 1PUX 匯出之間的差異，副檔名為 .json 時輸出 JSON，否則輸出 CSV
+
+    回傳各類差異（added、modified、deleted）的筆數。
+    """
+    for path in (old_path, new_path):
+        check_input_exists(path)
+    check_output_paths([output_path], (old_path, new_path))
+
+    counts = {'added': 0, 'modified': 0, 'deleted': 0}
+    delta_rows = _delta_rows(
+        iter_item_changes(old_path, new_path, include_archived, export_filter), counts
+    )
+    # changes.json.gz 這類壓縮輸出以去掉壓縮副檔名後的格式判斷
+    format_path = output_path
+    if output_path.suffix.lower() in COMPRESSION_SUFFIXES.values():
+        format_path = output_path.with_suffix('')
+    if format_path.suffix.lower() == '.json':
+        _write_delta_json(output_path, delta_rows, output_options)
+    else:
+        write_csv_rows(output_path, delta_rows, DELTA_FIELDNAMES, output_options)
+    return counts
+
+
+class FileResult(NamedTuple):
+    """批次轉換中單一檔案的結果"""
+    input_path: Path
+    output_path: Path
+    count: int
+    seconds: float
+    error: Optional[str] = None
+
+
+def _glob_base(pattern: str) -> Path:
+    """glob 樣式中第一個含萬用字元的部分之前的目錄"""
+    parts = []
+    for part in Path(pattern).parts:
+        if glob.has_magic(part):
+            break
+        parts.append(part)
+    return Path(*parts) if parts else Path()
+
+
+def expand_input_paths(patterns: Iterable[str]) -> List[Tuple[Path, Path]]:
+    """展開輸入參數中的目錄與 glob 樣式，回傳不重複的 (1PUX 檔案, 相對路徑) 清單
+
+    相對路徑是檔案相對於搜尋的目錄（或 glob 樣式中不含萬用字元的目錄）的路徑，
+    直接指定的檔案則只有檔名；批次模式以它決定輸出目錄下的位置。
+    """
+    paths: Dict[Path, Path] = {}
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            base = path
+            matches = sorted(path.rglob('*.1pux'))
+        elif not path.exists() and glob.has_magic(pattern):
+            base = _glob_base(pattern)
+            matches = sorted(Path(p) for p in glob.glob(pattern, recursive=True))
+        else:
+            base = path.parent
+            matches = [path]
+
+        for match in matches:
+            paths.setdefault(match, match.relative_to(base))
+
+    return list(paths.items())
+
+
+def _convert_file(
+    one_pux_path: Path,
+    output_path: Path,
+    include_archived: bool,
+    output_options: Optional[OutputOptions] = None,
+    export_filter: Optional[ExportFilter] = None,
+) -> FileResult:
+    """轉換單一檔案並記錄結果，錯誤不會中斷其他檔案"""
+    start = time.perf_counter()
+    try:
+        count = convert_1pux_to_csv(
+            one_pux_path, output_path, include_archived,
+            output_options=output_options, export_filter=export_filter,
+        )
+    except Exception as e:
+        return FileResult(one_pux_path, output_path, 0, time.perf_counter() - start, str(e))
+    return FileResult(one_pux_path, output_path, count, time.perf_counter() - start)
+
+
+def convert_many(
+    conversions: List[Tuple[Path, Path]],
+    include_archived: bool = False,
+    jobs: int = 1,
+    output_options: Optional[OutputOptions] = None,
+    export_filter: Optional[ExportFilter] = None,
+) -> Iterator[FileResult]:
+    """批次轉換多個 1PUX 檔案，jobs > 1 時以行程池同時處理，依完成順序產生結果"""
+    if jobs <= 1 or len(conversions) <= 1:
+        for one_pux_path, output_path in conversions:
+            yield _convert_file(
+                one_pux_path, output_path, include_archived, output_options, export_filter
+            )
+        return
+
+    with process_pool(min(jobs, len(conversions))) as executor:
+        futures = [
+            executor.submit(
+                _convert_file, one_pux_path, output_path, include_archived, output_options,
+                export_filter,
+            )
+            for one_pux_path, output_path in conversions
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def _plan_outputs(
+    input_paths: List[Tuple[Path, Path]], output_dir: Optional[Path], suffix: str = '.csv'
+) -> List[Tuple[Path, Path]]:
+    """決定批次模式下每個輸入檔的輸出路徑
+
+    指定 output_dir 時，輸出檔位於與輸入檔相同的相對路徑下，避免不同子目錄中的同名檔案衝突。
+    """
+    conversions = []
+    seen: Dict[Path, Path] = {}
+    for input_path, relative_path in input_paths:
+        if output_dir:
+            output_path = output_dir / relative_path.with_suffix(suffix)
+        else:
+            output_path = input_path.with_suffix(suffix)
+
+        if output_path in seen:
+            raise ValueError(f"輸出檔名衝突: {seen[output_path]} 與 {input_path} 都會寫入 {output_path}")
+        seen[output_path] = input_path
+        conversions.append((input_path, output_path))
+
+    return conversions
+
+
+def parse_size(text: str) -> int:
+    """解析 64K、4M 這類大小字串為位元組數"""
+    match = re.fullmatch(r'(\d+)([KkMmGg]?)[Bb]?', text.strip())
+    if not match:
+        raise argparse.ArgumentTypeError(f"無效的大小: {text}")
+    units = {'': 1, 'k': 1024, 'm': 1024 ** 2, 'g': 1024 ** 3}
+    size = int(match.group(1)) * units[match.group(2).lower()]
+    if size <= 0:
+        raise argparse.ArgumentTypeError(f"大小必須大於 0: {text}")
+    return size
+
+
+def parse_sink(text: str) -> Tuple[str, Path]:
+    """解析 FORMAT=PATH 形式的 --sink 參數"""
+    format_name, sep, path = text.partition('=')
+    if not sep or not path:
+        raise argparse.ArgumentTypeError(f"格式應為 FORMAT=PATH: {text}")
+    if format_name not in OUTPUT_FORMATS:
+        raise argparse.ArgumentTypeError(
+            f"不支援的輸出格式: {format_name}（可用：{'、'.join(OUTPUT_FORMATS)}）"
+        )
+    return format_name, Path(path)
+
+
+def parse_timestamp(text: str) -> int:
+    """解析 Unix 時間戳或 ISO 8601 日期時間（未指定時區時視為本地時間）"""
+    if text.isdigit():
+        return int(text)
+    try:
+        return int(datetime.fromisoformat(text).timestamp())
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"無效的時間: {text}") from None
+
+
+def build_export_filter(args: argparse.Namespace) -> Optional[ExportFilter]:
+    """依命令列參數建立篩選條件，未指定任何條件時回傳 None"""
+    if not (
+        args.account or args.vault or args.category or args.tag or args.state
+        or args.updated_after is not None or args.updated_before is not None
+    ):
+        return None
+    return ExportFilter(
+        args.account, args.vault, args.category, args.tag, args.state,
+        args.updated_after, args.updated_before,
+    )
+
+
+def _run_batch(
+    args: argparse.Namespace,
+    jobs: int,
+    output_options: OutputOptions,
+    export_filter: Optional[ExportFilter],
+) -> int:
+    """批次模式：轉換多個檔案並輸出每個檔案的摘要"""
+    input_paths = expand_input_paths(args.input)
+    if not input_paths:
+        print("錯誤: 找不到任何 1PUX 檔案", file=sys.stderr)
+        return 1
+
+    conversions = _plan_outputs(
+        input_paths, args.output, '.csv' + compressed_suffix(output_options)
+    )
+    for _, output_path in conversions:
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    failed = 0
+    total = 0
+    for result in convert_many(
+        conversions, args.include_archived, jobs, output_options, export_filter
+    ):
+        if result.error:
+            failed += 1
+            print(f"失敗 {result.input_path}: {result.error}", file=sys.stderr)
+        else:
+            total += result.count
+            print(
+                f"成功 {result.input_path} → {result.output_path}："
+                f"{result.count} 筆記錄，{result.seconds:.2f} 秒"
+            )
+
+    print(
+        f"共 {len(conversions)} 個檔案：成功 {len(conversions) - failed}、"
+        f"失敗 {failed}，合計 {total} 筆記錄"
+    )
+    return 1 if failed else 0
+
+
+def _open_input(path: Path) -> OnePuxSource:
+    """路徑為 - 時從 stdin 讀取 1PUX"""
+    return read_stdin_archive() if path == STDIO_PATH else path
+
+
+def _run_delta(
+    args: argparse.Namespace,
+    input_path: Path,
+    output_options: OutputOptions,
+    export_filter: Optional[ExportFilter],
+) -> int:
+    """差異模式：比較 --since 指定的舊匯出與輸入檔"""
+    if args.output:
+        output_path = args.output
+    elif input_path == STDIO_PATH:
+        output_path = STDIO_PATH
+    else:
+        output_path = input_path.with_suffix('.delta.csv' + compressed_suffix(output_options))
+    try:
+        counts = convert_1pux_delta(
+            _open_input(args.since), _open_input(input_path), output_path,
+            args.include_archived, output_options, export_filter,
+        )
+    except Exception as e:
+        print(f"錯誤: {e}", file=sys.stderr)
+        return 1
+
+    # 差異寫入 stdout 時，摘要改寫到 stderr 以免混入輸出
+    print(
+        f"差異：新增 {counts['added']} 筆、修改 {counts['modified']} 筆、"
+        f"刪除 {counts['deleted']} 筆，已寫入 {output_path}",
+        file=sys.stderr if output_path == STDIO_PATH else sys.stdout,
+    )
+    return 0
 
 
 def main():
@@ -301,34 +2559,279 @@ def main():
     )
     parser.add_argument(
         'input',
-        type=Path,
-        help='輸入的 1PUX 檔案路徑'
+        nargs='+',
+        help='輸入的 1PUX 檔案路徑，可指定多個檔案、目錄或 glob 樣式；- 表示從 stdin 讀取'
     )
     parser.add_argument(
         '-o', '--output',
         type=Path,
-        help='輸出的 CSV 檔案路徑（預設為輸入檔名 + .csv）'
+        help='輸出的 CSV 檔案路徑（預設為輸入檔名 + .csv，從 stdin 讀取時為 stdout）；'
+             '- 表示寫入 stdout；批次模式下為輸出目錄'
     )
     parser.add_argument(
         '--include-archived',
         action='store_true',
         help='包含已歸檔的項目'
     )
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=1,
+        help='使用的行程數（預設為 1，0 表示使用所有 CPU）；批次模式下用於同時轉換多個檔案'
+    )
+    parser.add_argument(
+        '--profile',
+        nargs='?',
+        const='text',
+        choices=['text', 'json'],
+        help='在 stderr 輸出各階段的耗時與記憶體峰值（text 或 json，預設 text）'
+    )
+    parser.add_argument(
+        '--cache',
+        type=Path,
+        help='轉換快取檔（SQLite）路徑，未變更的項目直接使用上次的轉換結果'
+    )
+    parser.add_argument(
+        '--split-vaults',
+        type=Path,
+        metavar='DIR',
+        help='每個 vault 各輸出一個 CSV 到此目錄；同時指定 -o 時另外輸出合併的 CSV'
+    )
+    parser.add_argument(
+        '--since',
+        type=Path,
+        metavar='OLD_1PUX',
+        help='只輸出相對於較舊 1PUX 匯出新增、修改或刪除的項目（輸出為 .json 時以 JSON 格式）'
+    )
+    parser.add_argument(
+        '--cache-key',
+        choices=['updatedAt', 'content'],
+        default='updatedAt',
+        help='判斷項目是否變更的依據：updatedAt（預設）或完整內容雜湊 content'
+    )
+    parser.add_argument(
+        '--output-buffer-size',
+        type=parse_size,
+        default=OUTPUT_BUFFER_SIZE,
+        metavar='SIZE',
+        help='輸出緩衝大小，累積到此大小才寫入檔案，可使用 K、M 單位（預設 4M）'
+    )
+    parser.add_argument(
+        '--fsync',
+        choices=['none', 'close', 'flush'],
+        default='none',
+        help='輸出檔同步到磁碟的時機：none（預設）、close（關閉前一次）或 flush（每次寫入）'
+    )
+    parser.add_argument(
+        '--drop-cache',
+        action='store_true',
+        help='寫入後通知系統釋放輸出檔的頁面快取（僅支援 posix_fadvise 的系統）'
+    )
+    parser.add_argument(
+        '--compress',
+        choices=['none', *COMPRESSION_SUFFIXES],
+        help='輸出壓縮格式（預設依副檔名 .gz、.xz、.zst 決定）；zstd 需要安裝 zstandard 套件'
+    )
+    parser.add_argument(
+        '--sink',
+        type=parse_sink,
+        action='append',
+        default=[],
+        metavar='FORMAT=PATH',
+        help=f"同時輸出其他格式，可重複指定（{'、'.join(OUTPUT_FORMATS)}）；"
+             '指定後只有明確給定 -o 時才輸出 Apple CSV'
+    )
+    parser.add_argument(
+        '--account',
+        action='append',
+        default=[],
+        metavar='NAME',
+        help='只轉換此帳號（名稱、email 或 uuid）的項目，可重複指定'
+    )
+    parser.add_argument(
+        '--vault',
+        action='append',
+        default=[],
+        metavar='NAME',
+        help='只轉換此 vault（名稱或 uuid）的項目，可重複指定；其他 vault 不會被解析'
+    )
+    parser.add_argument(
+        '--category',
+        action='append',
+        default=[],
+        metavar='UUID',
+        help='只轉換此分類（categoryUuid，例如 001 為 Login）的項目，可重複指定'
+    )
+    parser.add_argument(
+        '--tag',
+        action='append',
+        default=[],
+        help='只轉換帶有此標籤的項目，可重複指定（符合任一即可）'
+    )
+    parser.add_argument(
+        '--state',
+        action='append',
+        default=[],
+        help='只轉換此狀態（例如 active、archived、trashed）的項目，可重複指定；'
+             '指定時取代 --include-archived 的預設篩選'
+    )
+    parser.add_argument(
+        '--updated-after',
+        type=parse_timestamp,
+        metavar='TIME',
+        help='只轉換 updatedAt 不早於此時間的項目（Unix 時間戳或 ISO 8601，例如 2024-01-01）'
+    )
+    parser.add_argument(
+        '--updated-before',
+        type=parse_timestamp,
+        metavar='TIME',
+        help='只轉換 updatedAt 早於此時間的項目（Unix 時間戳或 ISO 8601）'
+    )
+    parser.add_argument(
+        '--attachments',
+        type=Path,
+        metavar='DIR',
+        help='同時將附件與文件擷取到此目錄，依 item uuid 分資料夾存放'
+    )
+    parser.add_argument(
+        '--attachment-workers',
+        type=int,
+        default=4,
+        help='同時寫入附件的執行緒數（預設 4）'
+    )
 
     args = parser.parse_args()
 
-    # 確定輸出路徑
-    if args.output:
+    if args.jobs < 0:
+        parser.error('--jobs 不可為負數')
+    if args.attachment_workers < 1:
+        parser.error('--attachment-workers 至少為 1')
+    jobs = args.jobs or os.cpu_count() or 1
+    output_options = OutputOptions(
+        args.output_buffer_size, args.fsync, args.drop_cache, args.compress
+    )
+    export_filter = build_export_filter(args)
+
+    # 多個輸入、目錄或 glob 樣式時進入批次模式
+    if len(args.input) > 1 or Path(args.input[0]).is_dir() or (
+        not Path(args.input[0]).exists() and glob.has_magic(args.input[0])
+    ):
+        if args.profile:
+            parser.error('--profile 僅支援單一輸入檔案')
+        if args.cache:
+            parser.error('--cache 僅支援單一輸入檔案')
+        if args.since:
+            parser.error('--since 僅支援單一輸入檔案')
+        if args.split_vaults:
+            parser.error('--split-vaults 僅支援單一輸入檔案')
+        if args.attachments:
+            parser.error('--attachments 僅支援單一輸入檔案')
+        if args.sink:
+            parser.error('--sink 僅支援單一輸入檔案')
+        try:
+            return _run_batch(args, jobs, output_options, export_filter)
+        except Exception as e:
+            print(f"錯誤: {e}", file=sys.stderr)
+            return 1
+
+    input_path = Path(args.input[0])
+
+    if args.attachments and input_path == STDIO_PATH:
+        parser.error('--attachments 不支援從 stdin 讀取')
+
+    if args.sink and (args.since or args.split_vaults):
+        parser.error('--sink 無法與 --since 或 --split-vaults 同時使用')
+
+    if args.since:
+        # 差異模式只比較兩份匯出，不使用快取、分段量測或行程池
+        if args.cache:
+            parser.error('--cache 無法與 --since 同時使用')
+        if args.profile:
+            parser.error('--profile 無法與 --since 同時使用')
+        if args.jobs != 1:
+            parser.error('--jobs 無法與 --since 同時使用')
+        if args.split_vaults:
+            parser.error('--split-vaults 無法與 --since 同時使用')
+        if args.attachments:
+            parser.error('--attachments 無法與 --since 同時使用')
+        if args.since == STDIO_PATH and input_path == STDIO_PATH:
+            parser.error('--since 與輸入檔不能同時從 stdin 讀取')
+        return _run_delta(args, input_path, output_options, export_filter)
+
+    # 確定輸出路徑（依 vault 分檔或另外指定 --sink 時只有明確指定 -o 才輸出 Apple CSV）
+    if args.output or args.split_vaults or args.sink:
         output_path = args.output
+    elif input_path == STDIO_PATH:
+        output_path = STDIO_PATH
     else:
-        output_path = args.input.with_suffix('.csv')
-
+        output_path = input_path.with_suffix('.csv' + compressed_suffix(output_options))
+    targets = ([('apple-csv', output_path)] if output_path else []) + args.sink
+    stdout_targets = [path for _, path in targets if path == STDIO_PATH]
+    if len(stdout_targets) > 1:
+        parser.error('只能有一個輸出寫入 stdout')
+    # 輸出寫入 stdout 時，訊息改寫到 stderr 以免混入輸出
+    status_file = sys.stderr if stdout_targets else sys.stdout
+
+    profiler = StageProfiler() if args.profile else None
+    cache = None
+    attachments = None
     try:
-        convert_1pux_to_csv(args.input, output_path, args.include_archived)
+        input_source = _open_input(input_path)
+        with profiler.activate() if profiler else nullcontext():
+            with RowCache(args.cache, args.cache_key) if args.cache else nullcontext() as cache, \
+                    AttachmentExtractor(
+                        input_source, args.attachments, args.attachment_workers
+                    ) if args.attachments else nullcontext() as attachments:
+                if args.split_vaults:
+                    vault_results = convert_1pux_to_vault_csvs(
+                        input_source, args.split_vaults, args.include_archived, jobs, cache,
+                        output_path, output_options, attachments, export_filter,
+                    )
+                    count = sum(result.count for result in vault_results)
+                elif args.sink:
+                    count = convert_1pux_to_sinks(
+                        input_source, targets, args.include_archived, jobs, cache,
+                        output_options, attachments, export_filter,
+                    )
+                else:
+                    count = convert_1pux_to_csv(
+                        input_source, output_path, args.include_archived, jobs, cache,
+                        output_options, attachments, export_filter,
+                    )
+                # 篩選時未讀到的項目仍可能在下次使用，不從快取移除
+                if cache and export_filter is None:
+                    cache.prune_unseen()
     except Exception as e:
-        print(f"錯誤: {e}", file=__import__('sys').stderr)
+        print(f"錯誤: {e}", file=sys.stderr)
         return 1
 
+    if args.split_vaults:
+        for result in vault_results:
+            print(
+                f"  {result.name or result.uuid}: {result.count} 筆 → {result.output_path}",
+                file=status_file,
+            )
+        print(f"成功轉換 {count} 筆記錄到 {len(vault_results)} 個 vault 檔案", file=status_file)
+        if output_path:
+            print(f"合併的 CSV 已寫入 {output_path}", file=status_file)
+    elif args.sink:
+        for format_name, path in targets:
+            print(f"  {format_name}: {path}", file=status_file)
+        print(f"成功轉換 {count} 筆記錄到 {len(targets)} 個輸出", file=status_file)
+    else:
+        print(f"成功轉換 {count} 筆記錄到 {output_path}", file=status_file)
+    if cache:
+        print(f"快取命中 {cache.hits} 筆，重新轉換 {cache.misses} 筆", file=status_file)
+    if attachments:
+        print(
+            f"已擷取 {attachments.extracted} 個附件"
+            f"（{attachments.bytes_written / 1024 / 1024:.1f} MB）到 {args.attachments}",
+            file=status_file,
+        )
+        if attachments.missing:
+            print(f"警告: {len(attachments.missing)} 個附件在 1PUX 中找不到", file=sys.stderr)
+    if profiler:
+        print(profiler.format_report(args.profile), file=sys.stderr)
     return 0
 
 
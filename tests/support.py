@@ -0,0 +1,19 @@
+"""測試共用的 1PUX 範例檔案"""
+
+import zipfile
+from pathlib import Path
+
+DATA_DIR = Path(__file__).parent / 'data'
+EXPORT_JSON = DATA_DIR / 'export.json'
+
+
+def write_1pux(
+    path: Path,
+    export_data: bytes,
+    compress_type: int = zipfile.ZIP_DEFLATED,
+) -> Path:
+    """以指定的 export.data 內容建立 1PUX 檔案"""
+    with zipfile.ZipFile(path, 'w') as zip_file:
+        zip_file.writestr('export.attributes', '{"version": 3}', compress_type=zipfile.ZIP_DEFLATED)
+        zip_file.writestr('export.data', export_data, compress_type=compress_type)
+    return path
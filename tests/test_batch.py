@@ -0,0 +1,77 @@
+"""批次模式：展開輸入並決定每個檔案的輸出路徑"""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+import main
+from tests.support import DATA_DIR, EXPORT_JSON, write_1pux
+
+
+class BatchTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+        data = EXPORT_JSON.read_bytes()
+        for relative in ('exports/alice/export.1pux', 'exports/bob/export.1pux', 'exports/bob/old/export.1pux'):
+            path = self.tmp / relative
+            path.parent.mkdir(parents=True, exist_ok=True)
+            write_1pux(path, data)
+
+    def test_directory_outputs_keep_relative_paths(self):
+        input_paths = main.expand_input_paths([str(self.tmp / 'exports')])
+        conversions = main._plan_outputs(input_paths, self.tmp / 'out')
+        self.assertEqual(
+            [(path.relative_to(self.tmp), output.relative_to(self.tmp)) for path, output in conversions],
+            [
+                (Path('exports/alice/export.1pux'), Path('out/alice/export.csv')),
+                (Path('exports/bob/export.1pux'), Path('out/bob/export.csv')),
+                (Path('exports/bob/old/export.1pux'), Path('out/bob/old/export.csv')),
+            ],
+        )
+
+        for path, output_path in conversions:
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+        results = list(main.convert_many(conversions, jobs=2))
+        self.assertFalse([result.error for result in results if result.error])
+        expected = (DATA_DIR / 'expected.csv').read_bytes()
+        for _, output_path in conversions:
+            self.assertEqual(output_path.read_bytes(), expected)
+
+    def test_glob_outputs_are_relative_to_pattern_directory(self):
+        pattern = str(self.tmp / 'exports' / '**' / '*.1pux')
+        conversions = main._plan_outputs(main.expand_input_paths([pattern]), self.tmp / 'out', '.csv.gz')
+        self.assertEqual(
+            sorted(output.relative_to(self.tmp) for _, output in conversions),
+            [Path('out/alice/export.csv.gz'), Path('out/bob/export.csv.gz'), Path('out/bob/old/export.csv.gz')],
+        )
+
+    def test_relative_glob(self):
+        cwd = os.getcwd()
+        os.chdir(self.tmp)
+        self.addCleanup(os.chdir, cwd)
+        self.assertEqual(
+            main.expand_input_paths(['exports/*/export.1pux']),
+            [
+                (Path('exports/alice/export.1pux'), Path('alice/export.1pux')),
+                (Path('exports/bob/export.1pux'), Path('bob/export.1pux')),
+            ],
+        )
+
+    def test_explicit_files_with_same_name_conflict(self):
+        input_paths = main.expand_input_paths([
+            str(self.tmp / 'exports/alice/export.1pux'), str(self.tmp / 'exports/bob/export.1pux'),
+        ])
+        with self.assertRaisesRegex(ValueError, '輸出檔名衝突'):
+            main._plan_outputs(input_paths, self.tmp / 'out')
+        # 未指定輸出目錄時輸出到各輸入檔旁
+        self.assertEqual(
+            [output for _, output in main._plan_outputs(input_paths, None)],
+            [self.tmp / 'exports/alice/export.csv', self.tmp / 'exports/bob/export.csv'],
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
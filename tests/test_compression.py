@@ -0,0 +1,91 @@
+"""壓縮輸出：背景壓縮執行緒的完整往返與錯誤回報"""
+
+import gzip
+import io
+import lzma
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+import main
+from tests.support import DATA_DIR, EXPORT_JSON, write_1pux
+
+
+class FailingCompressor:
+    """第二次壓縮時失敗的壓縮器，模擬背景執行緒中的錯誤"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def compress(self, data: bytes) -> bytes:
+        self.calls += 1
+        if self.calls > 1:
+            raise OSError('disk full')
+        return data
+
+    def flush(self) -> bytes:
+        return b''
+
+
+class CompressionTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+        self.one_pux_path = write_1pux(self.tmp / 'export.1pux', EXPORT_JSON.read_bytes())
+        self.expected = (DATA_DIR / 'expected.csv').read_bytes()
+
+    def test_round_trip(self):
+        for name, decompress in (('out.csv.gz', gzip.decompress), ('out.csv.xz', lzma.decompress)):
+            # 很小的緩衝區讓資料分成多塊經過背景執行緒
+            for buffer_size in (main.OUTPUT_BUFFER_SIZE, 64):
+                with self.subTest(output=name, buffer_size=buffer_size):
+                    output_path = self.tmp / name
+                    options = main.OutputOptions(buffer_size=buffer_size)
+                    main.convert_1pux_to_csv(self.one_pux_path, output_path, output_options=options)
+                    self.assertEqual(decompress(output_path.read_bytes()), self.expected)
+
+    def test_explicit_compression(self):
+        output_path = self.tmp / 'out.csv'
+        options = main.OutputOptions(compression='gzip')
+        main.convert_1pux_to_csv(self.one_pux_path, output_path, output_options=options)
+        self.assertEqual(gzip.decompress(output_path.read_bytes()), self.expected)
+
+    @unittest.skipUnless(main.zstandard, 'zstandard 未安裝')
+    def test_zstd_round_trip(self):
+        output_path = self.tmp / 'out.csv.zst'
+        main.convert_1pux_to_csv(self.one_pux_path, output_path)
+        with main.zstandard.ZstdDecompressor().stream_reader(output_path.read_bytes()) as reader:
+            self.assertEqual(reader.read(), self.expected)
+
+    def test_compressor_error_is_raised_from_close(self):
+        raw = io.BytesIO()
+        writer = main.BackgroundCompressor(raw, FailingCompressor())
+        writer.write(b'first')
+        writer.write(b'second')
+        with self.assertRaisesRegex(OSError, 'disk full'):
+            writer.close()
+        self.assertTrue(raw.closed)
+        self.assertTrue(writer.closed)
+
+    def test_compressor_error_is_raised_from_write(self):
+        writer = main.BackgroundCompressor(io.BytesIO(), FailingCompressor(), max_pending=1)
+        deadline = time.monotonic() + 10
+        with self.assertRaisesRegex(OSError, 'disk full'):
+            # 背景執行緒失敗後，之後的 write 會回報錯誤
+            while time.monotonic() < deadline:
+                writer.write(b'data')
+        with self.assertRaisesRegex(OSError, 'disk full'):
+            writer.close()
+
+    def test_failed_conversion_removes_compressed_output(self):
+        output_path = self.tmp / 'out.csv.gz'
+        broken_path = write_1pux(self.tmp / 'broken.1pux', EXPORT_JSON.read_bytes()[:-20])
+        with self.assertRaises(ValueError):
+            main.convert_1pux_to_csv(broken_path, output_path)
+        self.assertFalse(output_path.exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+"""Apple CSV 輸出必須與原始版本的轉換器逐位元組相同
+
+tests/data/expected*.csv 由原始版本的 main.py 以 tests/data/export.json 產生。
+"""
+
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+import main
+from tests.support import DATA_DIR, EXPORT_JSON, write_1pux
+
+
+class AppleCsvOutputTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+        data = EXPORT_JSON.read_bytes()
+        self.archives = {
+            'deflated': write_1pux(self.tmp / 'deflated.1pux', data),
+            'stored': write_1pux(self.tmp / 'stored.1pux', data, zipfile.ZIP_STORED),
+        }
+
+    def assert_output(self, expected_name: str, include_archived: bool, **kwargs):
+        expected = (DATA_DIR / expected_name).read_bytes()
+        for name, one_pux_path in self.archives.items():
+            with self.subTest(archive=name, **kwargs):
+                output_path = self.tmp / f'{name}.csv'
+                main.convert_1pux_to_csv(one_pux_path, output_path, include_archived, **kwargs)
+                self.assertEqual(output_path.read_bytes(), expected)
+
+    def test_matches_original_output(self):
+        self.assert_output('expected.csv', False)
+
+    def test_matches_original_output_with_archived(self):
+        self.assert_output('expected_archived.csv', True)
+
+    def test_parallel_output_is_identical(self):
+        self.assert_output('expected.csv', False, jobs=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+"""--since 差異模式：新增、修改、刪除與封存的項目"""
+
+import copy
+import csv
+import gzip
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import main
+from tests.support import EXPORT_JSON, write_1pux
+
+
+def vault_items(data, index=0):
+    return data['accounts'][0]['vaults'][index]['items']
+
+
+def find_item(data, uuid):
+    for vault in data['accounts'][0]['vaults']:
+        for item in vault['items']:
+            if item['uuid'] == uuid:
+                return item
+    raise KeyError(uuid)
+
+
+class DeltaTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+
+        old = json.loads(EXPORT_JSON.read_bytes())
+        new = copy.deepcopy(old)
+        # aaaa01 修改、aaaa06 刪除、cccc01 新增、aaaa02 在兩份匯出之間被封存
+        find_item(new, 'aaaa01')['overview']['title'] = 'Renamed login'
+        find_item(new, 'aaaa01')['updatedAt'] += 1
+        vault_items(new).remove(find_item(new, 'aaaa06'))
+        added = copy.deepcopy(find_item(old, 'aaaa03'))
+        added['uuid'] = 'cccc01'
+        added['overview']['title'] = 'Added login'
+        vault_items(new, 1).append(added)
+        find_item(new, 'aaaa02')['state'] = 'archived'
+
+        self.old_path = write_1pux(self.tmp / 'old.1pux', json.dumps(old).encode())
+        self.new_path = write_1pux(self.tmp / 'new.1pux', json.dumps(new).encode())
+
+    def test_item_changes(self):
+        changes = {
+            item['uuid']: change
+            for change, item in main.iter_item_changes(self.old_path, self.new_path)
+        }
+        # 預設不含封存項目，因此在兩份匯出之間被封存的項目會顯示為 deleted
+        self.assertEqual(changes, {
+            'aaaa01': 'modified',
+            'cccc01': 'added',
+            'aaaa06': 'deleted',
+            'aaaa02': 'deleted',
+        })
+
+    def test_item_changes_with_archived(self):
+        changes = {
+            item['uuid']: change
+            for change, item in main.iter_item_changes(self.old_path, self.new_path, include_archived=True)
+        }
+        self.assertEqual(changes, {
+            'aaaa01': 'modified',
+            'cccc01': 'added',
+            'aaaa06': 'deleted',
+            'aaaa02': 'modified',
+        })
+
+    def test_csv_output(self):
+        output_path = self.tmp / 'changes.csv'
+        counts = main.convert_1pux_delta(self.old_path, self.new_path, output_path)
+        self.assertEqual(counts, {'added': 1, 'modified': 1, 'deleted': 2})
+
+        with open(output_path, encoding='utf-8-sig', newline='') as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(list(rows[0]), main.DELTA_FIELDNAMES)
+        self.assertEqual(
+            [(row['Change'], row['UUID'], row['Title']) for row in rows],
+            [
+                ('modified', 'aaaa01', 'Renamed login'),
+                ('added', 'cccc01', 'Added login'),
+                ('deleted', 'aaaa02', '中文 名稱, "quoted"'),
+                ('deleted', 'aaaa06', 'Password history'),
+            ],
+        )
+
+    def test_json_output(self):
+        expected = [
+            ('modified', 'aaaa01', 'Renamed login'),
+            ('added', 'cccc01', 'Added login'),
+            ('deleted', 'aaaa02', '中文 名稱, "quoted"'),
+            ('deleted', 'aaaa06', 'Password history'),
+        ]
+        for name, read in (
+            ('changes.json', lambda path: path.read_text(encoding='utf-8')),
+            ('changes.json.gz', lambda path: gzip.decompress(path.read_bytes()).decode('utf-8')),
+        ):
+            with self.subTest(output=name):
+                output_path = self.tmp / name
+                main.convert_1pux_delta(self.old_path, self.new_path, output_path)
+                entries = json.loads(read(output_path))
+                self.assertEqual(
+                    [(entry['change'], entry['uuid'], entry['row']['Title']) for entry in entries],
+                    expected,
+                )
+                self.assertEqual(list(entries[0]['row']), main.CSV_FIELDNAMES)
+
+    def test_identical_exports(self):
+        output_path = self.tmp / 'empty.csv'
+        counts = main.convert_1pux_delta(self.old_path, self.old_path, output_path)
+        self.assertEqual(counts, {'added': 0, 'modified': 0, 'deleted': 0})
+        self.assertEqual(output_path.read_bytes(), ('﻿' + ','.join(main.DELTA_FIELDNAMES) + '\r\n').encode())
+
+
+if __name__ == '__main__':
+    unittest.main()
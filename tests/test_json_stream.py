@@ -0,0 +1,93 @@
+"""JSONStreamReader 在各種區塊大小下必須與 json.loads 的結果一致"""
+
+import io
+import json
+import random
+import tempfile
+import unittest
+from pathlib import Path
+
+import main
+from tests.support import EXPORT_JSON, write_1pux
+
+CHUNK_SIZES = (1, 2, 3, 5, 17)
+
+
+def random_value(rng: random.Random, depth: int = 0):
+    """產生隨機的 JSON 值，涵蓋跳脫字元、非 ASCII 字元與各種數字格式"""
+    kinds = ['str', 'int', 'float', 'literal']
+    if depth < 4:
+        kinds += ['list', 'dict'] * 2
+    kind = rng.choice(kinds)
+    if kind == 'str':
+        return ''.join(rng.choice('ab "\\/\n\t,:{}[]中文😀é\x00') for _ in range(rng.randrange(8)))
+    if kind == 'int':
+        return rng.choice([0, -1, 7, 12345678901234567890, -98765])
+    if kind == 'float':
+        return rng.choice([0.5, -1.25, 1e-7, 6.02e23, -3.0e10, 123.456])
+    if kind == 'literal':
+        return rng.choice([True, False, None])
+    if kind == 'list':
+        return [random_value(rng, depth + 1) for _ in range(rng.randrange(4))]
+    return {
+        f'k{n}{rng.choice(["", "中", " ", "\\"])}': random_value(rng, depth + 1)
+        for n in range(rng.randrange(4))
+    }
+
+
+class JSONStreamReaderTest(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(1234)
+        self.documents = [random_value(rng) for _ in range(200)]
+        # 頂層數字與區塊邊界上的數字
+        self.documents += [0, 12345, -1.5e10, [1, 22, 333, 4444], {'a': 10, 'b': [0.25]}]
+
+    def _texts(self, document):
+        yield json.dumps(document)
+        yield json.dumps(document, ensure_ascii=False, indent=2)
+        yield json.dumps(document, separators=(',', ':'))
+
+    def test_read_value_matches_json_loads(self):
+        for document in self.documents:
+            for text in self._texts(document):
+                for chunk_size in CHUNK_SIZES:
+                    with self.subTest(text=text[:40], chunk_size=chunk_size):
+                        reader = main.JSONStreamReader(io.StringIO(text), chunk_size)
+                        self.assertEqual(reader.read_value(), json.loads(text))
+
+    def test_iter_array_and_skip_value(self):
+        for document in self.documents:
+            if not isinstance(document, (list, dict)):
+                continue
+            text = json.dumps({'skipped': document, 'items': [document, 1, document]})
+            for chunk_size in CHUNK_SIZES:
+                with self.subTest(text=text[:40], chunk_size=chunk_size):
+                    reader = main.JSONStreamReader(io.StringIO(text), chunk_size)
+                    items = []
+                    for key in reader.iter_object():
+                        if key == 'items':
+                            for _ in reader.iter_array():
+                                items.append(reader.read_value())
+                        else:
+                            reader.skip_value(levels=2)
+                    self.assertEqual(items, [document, 1, document])
+
+    def test_iter_export_items_matches_json_loads(self):
+        data = EXPORT_JSON.read_bytes()
+        expected = [
+            item
+            for account in json.loads(data)['accounts']
+            for vault in account['vaults']
+            for item in vault['items']
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            # 帶 BOM 的 export.data，區塊邊界會切在多位元組字元中間
+            one_pux_path = write_1pux(Path(tmp) / 'export.1pux', '﻿'.encode() + data)
+            for chunk_size in CHUNK_SIZES:
+                with self.subTest(chunk_size=chunk_size):
+                    items = [item for _, _, item in main.iter_export_items(one_pux_path, chunk_size)]
+                    self.assertEqual(items, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+"""輸出路徑與輸入檔相同時必須在開啟任何輸出前拒絕，不能破壞輸入"""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+import main
+from tests.support import EXPORT_JSON, write_1pux
+
+
+class OutputPathTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+        self.one_pux_path = write_1pux(self.tmp / 'export.1pux', EXPORT_JSON.read_bytes())
+        self.original = self.one_pux_path.read_bytes()
+
+    def assert_rejected(self, func, *args, **kwargs):
+        with self.assertRaisesRegex(ValueError, '輸出檔與輸入檔相同'):
+            func(*args, **kwargs)
+        self.assertEqual(self.one_pux_path.read_bytes(), self.original)
+
+    def test_csv_output_is_input(self):
+        self.assert_rejected(main.convert_1pux_to_csv, self.one_pux_path, self.one_pux_path)
+
+    def test_output_is_link_to_input(self):
+        symlink = self.tmp / 'symlink.1pux'
+        symlink.symlink_to(self.one_pux_path)
+        hardlink = self.tmp / 'hardlink.1pux'
+        os.link(self.one_pux_path, hardlink)
+        for output_path in (symlink, hardlink, self.tmp / 'sub' / '..' / 'export.1pux'):
+            with self.subTest(output_path=output_path):
+                self.assert_rejected(main.convert_1pux_to_csv, self.one_pux_path, output_path)
+
+    def test_sink_output_is_input(self):
+        self.assert_rejected(
+            main.convert_1pux_to_sinks,
+            self.one_pux_path, [('apple-csv', self.tmp / 'out.csv'), ('sqlite', self.one_pux_path)],
+        )
+        self.assertFalse((self.tmp / 'out.csv').exists())
+
+    def test_merged_vault_output_is_input(self):
+        self.assert_rejected(
+            main.convert_1pux_to_vault_csvs,
+            self.one_pux_path, self.tmp / 'vaults', merged_path=self.one_pux_path,
+        )
+
+    def test_delta_output_is_input(self):
+        new_path = write_1pux(self.tmp / 'new.1pux', EXPORT_JSON.read_bytes())
+        self.assert_rejected(main.convert_1pux_delta, self.one_pux_path, new_path, self.one_pux_path)
+        self.assert_rejected(main.convert_1pux_delta, new_path, self.one_pux_path, self.one_pux_path)
+
+
+if __name__ == '__main__':
+    unittest.main()
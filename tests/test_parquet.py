@@ -0,0 +1,69 @@
+"""Parquet 輸出（需要 pyarrow，未安裝時略過）"""
+
+import csv
+import io
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import main
+from tests.support import DATA_DIR, EXPORT_JSON, write_1pux
+
+
+@unittest.skipUnless(main.pyarrow, 'pyarrow 未安裝')
+class ParquetSinkTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+        self.one_pux_path = write_1pux(self.tmp / 'export.1pux', EXPORT_JSON.read_bytes())
+        text = (DATA_DIR / 'expected.csv').read_bytes().decode('utf-8-sig')
+        self.expected_rows = list(csv.DictReader(io.StringIO(text, newline='')))
+
+    def convert(self, **kwargs):
+        output_path = self.tmp / 'out.parquet'
+        main.convert_1pux_to_sinks(self.one_pux_path, [('parquet', output_path)], **kwargs)
+        return main.pyarrow.parquet.ParquetFile(output_path)
+
+    def test_schema_and_rows(self):
+        parquet_file = self.convert()
+        schema = parquet_file.schema_arrow
+        pyarrow = main.pyarrow
+        for name in ('Vault', 'VaultUUID', 'Category'):
+            self.assertTrue(pyarrow.types.is_dictionary(schema.field(name).type), name)
+        for name in ('CreatedAt', 'UpdatedAt'):
+            # Parquet 沒有秒的單位，寫入的 timestamp('s') 讀回時可能是毫秒
+            self.assertTrue(pyarrow.types.is_timestamp(schema.field(name).type), name)
+
+        table = parquet_file.read()
+        rows = table.to_pylist()
+        self.assertEqual([{name: row[name] for name in main.CSV_FIELDNAMES} for row in rows], self.expected_rows)
+        self.assertEqual(
+            [row['Vault'] for row in rows], ['Personal'] * 5 + ['共享 Vault'] * 3
+        )
+        self.assertEqual(rows[0]['UUID'], 'aaaa01')
+        self.assertEqual(rows[0]['Category'], '001')
+        self.assertEqual(int(rows[0]['UpdatedAt'].timestamp()), 1700000000)
+        # 沒有時間欄位的 item 為 null
+        self.assertIsNone(rows[-1]['CreatedAt'])
+
+    def test_row_groups(self):
+        with mock.patch.object(main.ParquetSink, 'row_group_size', 3):
+            parquet_file = self.convert()
+        self.assertEqual(
+            [parquet_file.metadata.row_group(i).num_rows for i in range(parquet_file.num_row_groups)],
+            [3, 3, 2],
+        )
+        self.assertEqual(parquet_file.read().num_rows, 8)
+
+    def test_empty_export(self):
+        parquet_file = self.convert(export_filter=main.ExportFilter(vaults=['nomatch']))
+        self.assertEqual(parquet_file.read().num_rows, 0)
+        self.assertEqual(parquet_file.schema_arrow.names, main.CSV_FIELDNAMES + [
+            'Vault', 'VaultUUID', 'Category', 'UUID', 'CreatedAt', 'UpdatedAt',
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+"""增量轉換快取（RowCache）的命中、失效與清除"""
+
+import copy
+import json
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+import main
+from tests.support import DATA_DIR, EXPORT_JSON, write_1pux
+
+
+def find_item(data, uuid):
+    for vault in data['accounts'][0]['vaults']:
+        for item in vault['items']:
+            if item['uuid'] == uuid:
+                return item
+    raise KeyError(uuid)
+
+
+class RowCacheTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+        self.data = json.loads(EXPORT_JSON.read_bytes())
+        self.one_pux_path = write_1pux(self.tmp / 'export.1pux', EXPORT_JSON.read_bytes())
+        self.cache_path = self.tmp / 'cache.db'
+        self.expected = (DATA_DIR / 'expected.csv').read_bytes()
+
+    def convert(self, one_pux_path, key='updatedAt', **kwargs):
+        """以快取轉換，回傳 (命中數, 未命中數, 輸出內容)"""
+        output_path = self.tmp / 'out.csv'
+        with main.RowCache(self.cache_path, key) as cache:
+            main.convert_1pux_to_csv(one_pux_path, output_path, cache=cache, **kwargs)
+            return cache.hits, cache.misses, output_path.read_bytes()
+
+    def write_variant(self, name, change):
+        data = copy.deepcopy(self.data)
+        change(data)
+        return write_1pux(self.tmp / name, json.dumps(data).encode())
+
+    def test_hits_and_misses(self):
+        self.assertEqual(self.convert(self.one_pux_path), (0, 8, self.expected))
+        self.assertEqual(self.convert(self.one_pux_path), (8, 0, self.expected))
+        self.assertEqual(self.convert(self.one_pux_path, jobs=2), (8, 0, self.expected))
+
+    def test_changed_item_is_converted_again(self):
+        self.convert(self.one_pux_path)
+
+        def rename(data):
+            item = find_item(data, 'aaaa01')
+            item['overview']['title'] = 'Renamed'
+            item['updatedAt'] += 1
+
+        hits, misses, output = self.convert(self.write_variant('renamed.1pux', rename))
+        self.assertEqual((hits, misses), (7, 1))
+        self.assertIn(b'\r\nRenamed,', output)
+
+    def test_content_key(self):
+        def rename(data):
+            find_item(data, 'aaaa01')['overview']['title'] = 'Renamed'
+
+        renamed_path = self.write_variant('renamed.1pux', rename)
+        # updatedAt 未變更時預設的版本鍵會沿用舊結果
+        self.convert(self.one_pux_path)
+        hits, misses, output = self.convert(renamed_path)
+        self.assertEqual((hits, misses), (8, 0))
+        self.assertNotIn(b'Renamed', output)
+
+        self.cache_path.unlink()
+        self.convert(self.one_pux_path, key='content')
+        hits, misses, output = self.convert(renamed_path, key='content')
+        self.assertEqual((hits, misses), (7, 1))
+        self.assertIn(b'\r\nRenamed,', output)
+
+    def test_prune_unseen(self):
+        self.convert(self.one_pux_path, include_archived=True)
+
+        def delete(data):
+            items = data['accounts'][0]['vaults'][0]['items']
+            items.remove(find_item(data, 'aaaa06'))
+
+        with main.RowCache(self.cache_path) as cache:
+            main.convert_1pux_to_csv(
+                self.write_variant('deleted.1pux', delete), self.tmp / 'out.csv', True, cache=cache
+            )
+            self.assertEqual(cache.prune_unseen(), 1)
+
+        with sqlite3.connect(self.cache_path) as connection:
+            uuids = {uuid for uuid, in connection.execute("SELECT uuid FROM rows")}
+        self.assertEqual(len(uuids), 9)
+        self.assertNotIn('aaaa06', uuids)
+
+    def test_version_change_invalidates_cache(self):
+        self.convert(self.one_pux_path)
+        with sqlite3.connect(self.cache_path) as connection:
+            connection.execute("UPDATE meta SET value = '0' WHERE key = 'version'")
+        self.assertEqual(self.convert(self.one_pux_path), (0, 8, self.expected))
+
+    def test_parallel_merge_keeps_order(self):
+        items = list(main.iter_included_items(self.one_pux_path, True))
+        expected = [converted.as_csv_tuple() for converted in main.convert_items(items)]
+
+        # 只快取一半的 items，讓每個批次同時包含命中與未命中
+        with main.RowCache(self.cache_path) as cache:
+            list(main.convert_items(items[::2], cache=cache))
+        with main.RowCache(self.cache_path) as cache:
+            converted = list(main.convert_items(items, 2, batch_size=3, cache=cache))
+            self.assertEqual((cache.hits, cache.misses), (5, 5))
+        self.assertEqual([c.as_csv_tuple() for c in converted], expected)
+
+    def test_lookup_many_keeps_order(self):
+        items = [item for _, item in main.iter_included_items(self.one_pux_path, True)]
+        with main.RowCache(self.cache_path) as cache:
+            for item in items[1::2]:
+                uuid, digest, _ = cache.lookup(item)
+                cache.store(uuid, digest, main.convert_item(item))
+            results = cache.lookup_many(items + [{'title': 'no uuid'}])
+
+        self.assertEqual([uuid for uuid, _, _ in results], [item['uuid'] for item in items] + [None])
+        self.assertEqual(
+            [csv_fields is not None for _, _, csv_fields in results],
+            [index % 2 == 1 for index in range(len(items))] + [False],
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+"""輸出格式（OutputSink）的註冊與共用行為"""
+
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+import main
+from tests.support import EXPORT_JSON, write_1pux
+
+
+class OutputSinkTest(unittest.TestCase):
+    def test_incomplete_sink_fails_on_construction(self):
+        class IncompleteSink(main.CsvSink):
+            pass
+
+        with tempfile.TemporaryDirectory() as tmp:
+            output_path = Path(tmp) / 'out.csv'
+            with self.assertRaises(TypeError):
+                IncompleteSink(output_path)
+            self.assertFalse(output_path.exists())
+
+    def test_duplicate_outputs_are_rejected(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            output_path = Path(tmp) / 'same.csv'
+            for other in (output_path, Path(tmp) / 'sub' / '..' / 'same.csv'):
+                with self.subTest(other=other):
+                    with self.assertRaisesRegex(ValueError, '多個輸出寫入同一個檔案'):
+                        main.open_sinks([('apple-csv', output_path), ('chrome-csv', other)])
+                    self.assertFalse(output_path.exists())
+
+            with self.assertRaisesRegex(ValueError, '多個輸出寫入同一個檔案'):
+                main.open_sinks([('apple-csv', main.STDIO_PATH), ('chrome-csv', main.STDIO_PATH)])
+
+    def test_output_matching_source_is_rejected(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            source = Path(tmp) / 'export.1pux'
+            source.write_bytes(b'PK')
+            with self.assertRaisesRegex(ValueError, '輸出檔與輸入檔相同'):
+                main.open_sinks([('apple-csv', Path(tmp) / 'out.csv'), ('sqlite', source)], sources=[source])
+            self.assertEqual(source.read_bytes(), b'PK')
+            self.assertFalse((Path(tmp) / 'out.csv').exists())
+
+    def test_sqlite_replaces_output_only_on_success(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            one_pux_path = write_1pux(tmp / 'export.1pux', EXPORT_JSON.read_bytes())
+            db_path = tmp / 'items.db'
+            db_path.write_bytes(b'previous')
+
+            # 讀到一半失敗時保留原本的檔案，也不留下暫存檔
+            broken_path = write_1pux(tmp / 'broken.1pux', EXPORT_JSON.read_bytes()[:-20])
+            with self.assertRaises(ValueError):
+                main.convert_1pux_to_sinks(broken_path, [('sqlite', db_path)])
+            self.assertEqual(db_path.read_bytes(), b'previous')
+            self.assertEqual(sorted(p.name for p in tmp.iterdir()), ['broken.1pux', 'export.1pux', 'items.db'])
+
+            count = main.convert_1pux_to_sinks(one_pux_path, [('sqlite', db_path)])
+            with sqlite3.connect(db_path) as connection:
+                self.assertEqual(connection.execute("SELECT count(*) FROM items").fetchone()[0], count)
+            self.assertEqual(sorted(p.name for p in tmp.iterdir()), ['broken.1pux', 'export.1pux', 'items.db'])
+
+    def test_registered_formats_are_complete(self):
+        for name, sink_class in main.OUTPUT_FORMATS.items():
+            with self.subTest(format=name):
+                self.assertFalse(sink_class.__abstractmethods__)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+"""未壓縮（ZIP_STORED）的 export.data 透過 mmap 直接讀取，無法定位時退回 ZipFile.open"""
+
+import io
+import json
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+from unittest import mock
+
+import main
+from tests.support import EXPORT_JSON, write_1pux
+
+BOM = '﻿'.encode()
+
+
+class StoredMemberTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+        self.data = EXPORT_JSON.read_bytes()
+        self.expected = json.loads(self.data)
+
+    def read_export(self, one_pux_path):
+        """回傳 (讀取器類型, 解析後的 export.data)"""
+        with main.open_export_data(one_pux_path) as (_, raw):
+            kind = type(raw)
+            text = bytes(raw.read()).decode('utf-8-sig')
+        return kind, json.loads(text)
+
+    def test_stored_member_with_bom(self):
+        one_pux_path = write_1pux(self.tmp / 'bom.1pux', BOM + self.data, zipfile.ZIP_STORED)
+        kind, data = self.read_export(one_pux_path)
+        self.assertIs(kind, main.MappedMemberReader)
+        self.assertEqual(data, self.expected)
+        self.assertEqual(main.extract_export_data(one_pux_path), self.expected)
+
+    def test_stored_member_from_memory(self):
+        one_pux_path = write_1pux(self.tmp / 'stdin.1pux', BOM + self.data, zipfile.ZIP_STORED)
+        kind, data = self.read_export(io.BytesIO(one_pux_path.read_bytes()))
+        self.assertIs(kind, main.MappedMemberReader)
+        self.assertEqual(data, self.expected)
+
+    def test_stored_member_with_extra_field(self):
+        one_pux_path = self.tmp / 'extra.1pux'
+        info = zipfile.ZipInfo('export.data', date_time=(2024, 1, 1, 0, 0, 0))
+        info.compress_type = zipfile.ZIP_STORED
+        # 未知的 extra 區塊（header id 0xcafe，長度 4）會寫入 local header
+        info.extra = b'\xfe\xca\x04\x00abcd'
+        with zipfile.ZipFile(one_pux_path, 'w') as zip_file:
+            zip_file.writestr('export.attributes', '{"version": 3}')
+            zip_file.writestr(info, self.data)
+
+        with zipfile.ZipFile(one_pux_path) as zip_file:
+            info = zip_file.getinfo('export.data')
+        header = one_pux_path.read_bytes()[info.header_offset:info.header_offset + main._LOCAL_HEADER.size]
+        self.assertEqual(main._LOCAL_HEADER.unpack(header)[2], 8)
+
+        kind, data = self.read_export(one_pux_path)
+        self.assertIs(kind, main.MappedMemberReader)
+        self.assertEqual(data, self.expected)
+
+    def test_bad_signature_returns_none(self):
+        one_pux_path = write_1pux(self.tmp / 'sig.1pux', self.data, zipfile.ZIP_STORED)
+        with zipfile.ZipFile(one_pux_path) as zip_file:
+            info = zip_file.getinfo('export.data')
+        archive = bytearray(one_pux_path.read_bytes())
+        self.assertIsNotNone(main._stored_member_view(archive, info))
+
+        archive[info.header_offset:info.header_offset + 4] = b'XXXX'
+        self.assertIsNone(main._stored_member_view(archive, info))
+        # 截斷的檔案同樣無法定位
+        self.assertIsNone(main._stored_member_view(self.data[:10], info))
+
+    def test_falls_back_to_zipfile_open(self):
+        one_pux_path = write_1pux(self.tmp / 'fallback.1pux', BOM + self.data, zipfile.ZIP_STORED)
+        with mock.patch.object(main, '_stored_member_view', return_value=None) as view:
+            kind, data = self.read_export(one_pux_path)
+        view.assert_called_once()
+        self.assertIs(kind, zipfile.ZipExtFile)
+        self.assertEqual(data, self.expected)
+
+    def test_corrupted_signature_is_reported_by_zipfile(self):
+        one_pux_path = write_1pux(self.tmp / 'corrupt.1pux', self.data, zipfile.ZIP_STORED)
+        with zipfile.ZipFile(one_pux_path) as zip_file:
+            offset = zip_file.getinfo('export.data').header_offset
+        archive = bytearray(one_pux_path.read_bytes())
+        archive[offset:offset + 4] = b'XXXX'
+        one_pux_path.write_bytes(archive)
+
+        # 無法透過 mmap 定位時交給 ZipFile.open，由它回報損毀
+        with self.assertRaises(zipfile.BadZipFile):
+            self.read_export(one_pux_path)
+
+    def test_crc_mismatch(self):
+        one_pux_path = write_1pux(self.tmp / 'crc.1pux', self.data, zipfile.ZIP_STORED)
+        with zipfile.ZipFile(one_pux_path) as zip_file:
+            info = zip_file.getinfo('export.data')
+        archive = bytearray(one_pux_path.read_bytes())
+        start = info.header_offset + main._LOCAL_HEADER.size + len(info.filename.encode()) + len(info.extra)
+        # 將某個空白改成換行，JSON 仍然有效但 CRC 不符
+        position = archive.index(b'  ', start)
+        archive[position] = ord('\n')
+        one_pux_path.write_bytes(archive)
+
+        with self.assertRaises(zipfile.BadZipFile):
+            self.read_export(one_pux_path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+"""--split-vaults：依 vault 分檔輸出與合併輸出"""
+
+import codecs
+import copy
+import csv
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import main
+from tests.support import DATA_DIR, EXPORT_JSON, write_1pux
+
+
+def read_rows(path: Path):
+    data = path.read_bytes()
+    # 每個檔案只能有一個 BOM（附加模式續寫時不能再寫入）
+    assert data.startswith(codecs.BOM_UTF8) and data.count(codecs.BOM_UTF8) == 1, path
+    return list(csv.reader(io.StringIO(data.decode('utf-8-sig'), newline='')))
+
+
+class VaultCsvsTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+        self.data = json.loads(EXPORT_JSON.read_bytes())
+        header, *rows = read_rows(DATA_DIR / 'expected.csv')
+        self.header = header
+        # expected.csv 依匯出順序排列：Personal 的 5 筆，接著共享 Vault 的 3 筆
+        self.personal_rows = rows[:5]
+        self.shared_rows = rows[5:]
+
+    def split(self, data, name='export.1pux'):
+        one_pux_path = write_1pux(self.tmp / name, json.dumps(data).encode())
+        output_dir = self.tmp / 'vaults'
+        merged_path = self.tmp / 'merged.csv'
+        results = main.convert_1pux_to_vault_csvs(one_pux_path, output_dir, merged_path=merged_path)
+        return results, output_dir, merged_path
+
+    def assert_shards(self, results, output_dir):
+        self.assertEqual(
+            [(result.name, result.uuid, result.output_path.name, result.count) for result in results],
+            [
+                ('Personal', 'VAULT1', 'Personal-VAULT1.csv', 5),
+                ('共享 Vault', 'VAULT2', '共享 Vault-VAULT2.csv', 3),
+            ],
+        )
+        # 沒有項目的 vault 不會建立檔案
+        self.assertEqual(
+            sorted(path.name for path in output_dir.iterdir()),
+            ['Personal-VAULT1.csv', '共享 Vault-VAULT2.csv'],
+        )
+        self.assertEqual(read_rows(results[0].output_path), [self.header] + self.personal_rows)
+        self.assertEqual(read_rows(results[1].output_path), [self.header] + self.shared_rows)
+
+    def test_shards_and_merged_output(self):
+        results, output_dir, merged_path = self.split(self.data)
+        self.assert_shards(results, output_dir)
+        self.assertEqual(merged_path.read_bytes(), (DATA_DIR / 'expected.csv').read_bytes())
+
+    def test_reappearing_vault_is_appended(self):
+        data = copy.deepcopy(self.data)
+        vaults = data['accounts'][0]['vaults']
+        personal = vaults[0]
+        # Personal 的 items 分成兩段，中間夾著共享 Vault
+        vaults[:] = [
+            {'attrs': personal['attrs'], 'items': personal['items'][:2]},
+            vaults[1],
+            {'attrs': personal['attrs'], 'items': personal['items'][2:]},
+        ]
+        results, output_dir, merged_path = self.split(data)
+        self.assert_shards(results, output_dir)
+        self.assertEqual(
+            read_rows(merged_path),
+            [self.header] + self.personal_rows[:2] + self.shared_rows + self.personal_rows[2:],
+        )
+
+    def test_attrs_after_items(self):
+        data = copy.deepcopy(self.data)
+        for account in data['accounts']:
+            account['vaults'] = [
+                {'items': vault['items'], 'attrs': vault['attrs']} for vault in account['vaults']
+            ]
+        results, output_dir, merged_path = self.split(data)
+        self.assert_shards(results, output_dir)
+        self.assertEqual(merged_path.read_bytes(), (DATA_DIR / 'expected.csv').read_bytes())
+
+    def test_parallel_output_is_identical(self):
+        one_pux_path = write_1pux(self.tmp / 'export.1pux', EXPORT_JSON.read_bytes())
+        results = main.convert_1pux_to_vault_csvs(one_pux_path, self.tmp / 'vaults', jobs=2)
+        self.assert_shards(results, self.tmp / 'vaults')
+
+
+if __name__ == '__main__':
+    unittest.main()